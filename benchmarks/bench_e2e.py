@@ -0,0 +1,231 @@
+"""
+Сквозной бенчмарк парсера против локального сервера вместо championat.com.
+
+    python -m benchmarks.bench_e2e --days 3 --matches-per-day 20
+    python -m benchmarks.bench_e2e --from-snapshots ./snapshots --engine http
+
+Каждый прогон идет в отдельном временном каталоге (свой кэш, хранилище
+и база), результат сохраняется в benchmarks/results/ в JSON для сравнения
+между коммитами. Нужен установленный Chrome, как и для обычного парсинга.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import queue
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.fixtures import synthetic_fixtures, snapshot_fixtures
+from benchmarks.stand_in_server import StandInServer
+from tools.generate_urls_to_parse import runner
+from tools.progress import MATCH_PARSED, DAY_FINISHED
+from tools.read_data_from_page import ENGINES, DEFAULT_ENGINE, MATCH_WORKERS
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def percentile(values, q):
+    """Перцентиль q (0-100) методом ближайшего ранга, None для пустого списка"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def peak_rss_mb():
+    """Пиковый RSS процесса и его завершенных дочерних процессов, МБ"""
+    # В Linux ru_maxrss в килобайтах, в macOS - в байтах
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(RESULTS_DIR),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def drain(events):
+    items = []
+    while True:
+        try:
+            items.append(events.get_nowait())
+        except queue.Empty:
+            return items
+
+
+def run_once(base_url, server, days, league, workers, match_workers, engine):
+    """Один прогон runner; возвращает метрики"""
+    before = dict(server.counts)
+    events = queue.Queue()
+    start = time.perf_counter()
+    paths = runner(
+        days=days,
+        league=league,
+        workers=workers,
+        match_workers=match_workers,
+        engine=engine,
+        events=events,
+        base_url=base_url,
+    )
+    wall = time.perf_counter() - start
+
+    received = drain(events)
+    match_latencies = [e["duration"] for e in received if e["event"] == MATCH_PARSED]
+    day_latencies = [e["duration"] for e in received if e["event"] == DAY_FINISHED]
+    with open(paths["json"], "r", encoding="utf-8") as f:
+        matches = json.load(f)["matches_found"]
+
+    timings = paths["timings"]
+    scrape_seconds = timings["scrape"]["seconds"]
+    pages = {kind: server.counts[kind] - before[kind] for kind in server.counts}
+    served = pages["day"] + pages["match"]
+    return {
+        "wall_seconds": round(wall, 3),
+        "scrape_seconds": scrape_seconds,
+        "db_seconds": timings["database"]["seconds"],
+        "export_json_seconds": timings["export_json"]["seconds"],
+        "pages_served": pages,
+        "matches": matches,
+        "pages_per_sec": round(served / scrape_seconds, 2) if scrape_seconds else None,
+        "matches_per_sec": round(matches / scrape_seconds, 2) if scrape_seconds else None,
+        "match_latency_p50": percentile(match_latencies, 50),
+        "match_latency_p95": percentile(match_latencies, 95),
+        "day_latency_p50": percentile(day_latencies, 50),
+        "day_latency_p95": percentile(day_latencies, 95),
+        "timings": timings,
+    }
+
+
+def run_benchmark(
+    fixtures,
+    days,
+    league="_superleague",
+    workers=1,
+    match_workers=MATCH_WORKERS,
+    engine=DEFAULT_ENGINE,
+    repeat=1,
+    keep_workdir=False,
+):
+    """
+    Поднимает StandInServer с fixtures и прогоняет runner repeat раз
+    в одном временном каталоге: первый прогон - с холодным кэшем,
+    следующие - с прогретым.
+    """
+    workdir = tempfile.mkdtemp(prefix="parser_bench_")
+    cwd = os.getcwd()
+    runs = []
+    try:
+        os.chdir(workdir)
+        with StandInServer(fixtures) as server:
+            for _ in range(repeat):
+                runs.append(
+                    run_once(
+                        server.base_url, server, days, league, workers, match_workers, engine
+                    )
+                )
+    finally:
+        os.chdir(cwd)
+        if keep_workdir:
+            print(f"Рабочий каталог бенчмарка: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "benchmark": "e2e",
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "params": {
+            "days": days,
+            "league": league,
+            "workers": workers,
+            "match_workers": match_workers,
+            "engine": engine,
+            "repeat": repeat,
+            "match_pages": len(fixtures["pages"]),
+        },
+        "runs": runs,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def save_result(result, output_dir=RESULTS_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    name = f"{result['benchmark']}_{time.strftime('%Y%m%d_%H%M%S')}_{result['commit'] or 'nogit'}.json"
+    path = os.path.join(output_dir, name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def print_result(result):
+    for i, run in enumerate(result["runs"], 1):
+        print(
+            f"Прогон {i}: {run['pages_per_sec']} стр/с, {run['matches_per_sec']} матчей/с, "
+            f"матч p50/p95 {run['match_latency_p50']}/{run['match_latency_p95']} с, "
+            f"база {run['db_seconds']} с, всего {run['wall_seconds']} с"
+        )
+    rss = result["peak_rss_mb"]
+    print(f"Пиковый RSS: {rss['self']} МБ (процесс), {rss['children']} МБ (дочерние)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Сквозной бенчмарк парсера")
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--matches-per-day", type=int, default=20)
+    parser.add_argument("--league", default="_superleague")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--match-workers", type=int, default=MATCH_WORKERS)
+    parser.add_argument("--engine", choices=ENGINES, default=DEFAULT_ENGINE)
+    parser.add_argument("--repeat", type=int, default=1, help="Прогоны подряд: первый с холодным кэшем")
+    parser.add_argument(
+        "--from-snapshots",
+        metavar="DIR",
+        help="Отдавать записанные страницы из хранилища снимков вместо синтетических",
+    )
+    parser.add_argument("--output", default=RESULTS_DIR, help="Каталог для JSON с результатами")
+    parser.add_argument("--keep-workdir", action="store_true")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.from_snapshots:
+        fixtures = snapshot_fixtures(args.from_snapshots)
+        days = len(fixtures["days"])
+    else:
+        fixtures = synthetic_fixtures(args.days, args.matches_per_day, args.league)
+        days = args.days
+    result = run_benchmark(
+        fixtures,
+        days,
+        league=args.league,
+        workers=args.workers,
+        match_workers=args.match_workers,
+        engine=args.engine,
+        repeat=args.repeat,
+        keep_workdir=args.keep_workdir,
+    )
+    print_result(result)
+    print(f"Результат сохранен: {save_result(result, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Микробенчмарки чистого Python: разбор текста матча, проверка имен,
+разбиение составов, сохранение JSON и сборка базы - без браузера и сети.
+
+    python -m benchmarks.bench_micro
+    python -m benchmarks.bench_micro --sizes 10000 100000 1000000 --only create_hockey_database
+
+Данные генерирует benchmarks.fixtures.synthetic_matches в формате
+matches_data.json. Для каждой функции и размера считаются операции в секунду
+и память (tracemalloc, отдельным прогоном, чтобы трассировка не искажала время).
+Миллион матчей занимает в памяти порядка 1-2 ГБ.
+"""
+import argparse
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+from benchmarks.bench_e2e import git_commit, save_result, RESULTS_DIR
+from benchmarks.fixtures import synthetic_matches
+from tools.database_tools.extract_time_from_match_text import extract_time_from_match_text
+from tools.database_tools.generate_db import create_hockey_database
+from tools.extract_teams_from_match_text import extract_teams_from_match_text
+from tools.is_valid_name import is_valid_player, _is_valid_player_cached
+from tools.json_tools.match_store import get_match_store
+from tools.json_tools.save_to_json import save_to_json, store_path_for
+from tools.read_data_from_page import make_teams
+
+DEFAULT_SIZES = [10_000, 100_000]
+POSITION_CODES = {"Нападающий": "нп", "Вратарь": "вр", "Защитник": "зщ"}
+
+
+def build_inputs(size, workdir):
+    """Входные данные всех бенчмарков для size матчей"""
+    matches = list(synthetic_matches(size))
+    # Составы в synthetic_matches общие, поэтому входы make_teams считаются один раз на состав
+    teams_inputs = {}
+    lineups = []
+    for match in matches:
+        key = id(match["stats"]["lineup_team1"])
+        if key not in teams_inputs:
+            players = match["stats"]["lineup_team1"] + match["stats"]["lineup_team2"]
+            teams_inputs[key] = (
+                [player["name"] for player in players],
+                [POSITION_CODES[player["position"]] for player in players],
+            )
+        lineups.append(teams_inputs[key])
+    return {
+        "matches": matches,
+        "texts": [match["text"] for match in matches],
+        # Имена в порядке появления в составах: повторы как в реальной истории
+        "names": [
+            match["stats"]["lineup_team1"][i % 20]["name"] for i, match in enumerate(matches)
+        ],
+        "lineups": lineups,
+        "json_path": os.path.join(workdir, "matches_data.json"),
+        "db_path": os.path.join(workdir, "hockey_matches.db"),
+    }
+
+
+def bench_extract_teams(inputs):
+    for text in inputs["texts"]:
+        extract_teams_from_match_text(text)
+    return len(inputs["texts"])
+
+
+def bench_is_valid_player(inputs):
+    # Каждый прогон начинается с пустого кэша имен
+    _is_valid_player_cached.cache_clear()
+    for name in inputs["names"]:
+        is_valid_player(name)
+    return len(inputs["names"])
+
+
+def bench_make_teams(inputs):
+    for names, positions in inputs["lineups"]:
+        make_teams(names, positions)
+    return len(inputs["lineups"])
+
+
+def bench_extract_time(inputs):
+    for text in inputs["texts"]:
+        extract_time_from_match_text(text)
+    return len(inputs["texts"])
+
+
+def bench_save_to_json(inputs):
+    get_match_store(store_path_for(inputs["json_path"])).clear()
+    save_to_json(inputs["matches"], inputs["json_path"])
+    return len(inputs["matches"])
+
+
+def bench_export_json(inputs):
+    return get_match_store(store_path_for(inputs["json_path"])).export_json(
+        inputs["json_path"]
+    )
+
+
+def bench_create_hockey_database(inputs):
+    create_hockey_database(inputs["json_path"], inputs["db_path"])
+    return len(inputs["matches"])
+
+
+# Порядок важен: export_json читает то, что записал save_to_json,
+# а create_hockey_database - то, что выгрузил export_json
+BENCHMARKS = {
+    "extract_teams_from_match_text": bench_extract_teams,
+    "is_valid_player": bench_is_valid_player,
+    "make_teams": bench_make_teams,
+    "extract_time_from_match_text": bench_extract_time,
+    "save_to_json": bench_save_to_json,
+    "export_json": bench_export_json,
+    "create_hockey_database": bench_create_hockey_database,
+}
+# Бенчмарки, которым нужны файлы предыдущих
+REQUIRES = {
+    "export_json": "save_to_json",
+    "create_hockey_database": "export_json",
+}
+
+
+def measure(bench, inputs, allocations=True):
+    start = time.perf_counter()
+    ops = bench(inputs)
+    seconds = time.perf_counter() - start
+    result = {
+        "ops": ops,
+        "seconds": round(seconds, 4),
+        "ops_per_sec": round(ops / seconds, 1) if seconds else None,
+    }
+    if allocations:
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        bench(inputs)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["alloc_peak_mb"] = round((peak - before) / 2**20, 2)
+        result["alloc_retained_mb"] = round((current - before) / 2**20, 2)
+        result["alloc_peak_bytes_per_op"] = round((peak - before) / ops) if ops else None
+    return result
+
+
+def selected(only):
+    """Выбранные бенчмарки вместе с теми, от чьих файлов они зависят"""
+    names = set(only or BENCHMARKS)
+    for name in list(names):
+        while name in REQUIRES:
+            name = REQUIRES[name]
+            names.add(name)
+    return [name for name in BENCHMARKS if name in names]
+
+
+def run_micro(sizes=DEFAULT_SIZES, only=None, allocations=True):
+    names = selected(only)
+    results = {name: [] for name in names}
+    for size in sizes:
+        workdir = tempfile.mkdtemp(prefix="parser_micro_")
+        try:
+            inputs = build_inputs(size, workdir)
+            for name in names:
+                row = {"size": size, **measure(BENCHMARKS[name], inputs, allocations)}
+                results[name].append(row)
+                print(
+                    f"{name:32} {size:>9} матчей: {row['ops_per_sec']:>12} оп/с"
+                    + (f", пик {row['alloc_peak_mb']} МБ" if allocations else "")
+                )
+            del inputs
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "benchmark": "micro",
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "params": {"sizes": list(sizes), "allocations": allocations},
+        "results": results,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Микробенчмарки разбора и сохранения матчей")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS))
+    parser.add_argument("--no-alloc", action="store_true", help="Не замерять память")
+    parser.add_argument("--output", default=RESULTS_DIR, help="Каталог для JSON с результатами")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    result = run_micro(args.sizes, args.only, allocations=not args.no_alloc)
+    print(f"Результат сохранен: {save_result(result, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import random
+import re
+from datetime import date, datetime, timedelta
+from html import escape
+from itertools import product
+from urllib.parse import urlsplit
+from tools.is_valid_name import is_valid_player
+from tools.snapshot_tools.snapshot_store import (
+    SnapshotStore,
+    load_snapshot,
+    SNAPSHOT_DIR,
+    DAY_KIND,
+    MATCH_KIND,
+)
+
+# Команды без цифр и служебных слов, чтобы разбор текста матча шел обычным путем
+CLUBS = [
+    "Амур", "Трактор", "Сибирь", "Авангард", "Барыс", "Лада", "Локомотив",
+    "Нефтехимик", "СКА", "Северсталь", "Спартак", "Торпедо", "ЦСКА",
+    "Ак Барс", "Салават Юлаев", "Автомобилист", "Адмирал",
+]
+STADIUMS = [
+    ("Платинум-Арена", "Хабаровск", 7100),
+    ("Арена-Омск", "Омск", 12000),
+    ("Сибирь-Арена", "Новосибирск", 10500),
+    ("Лада-Арена", "Тольятти", 6000),
+    ("Арена-2000", "Ярославль", 9000),
+]
+FIRST_NAMES = [
+    "Максим", "Егор", "Илья", "Артём", "Кирилл", "Денис", "Павел", "Антон",
+    "Олег", "Глеб", "Тимур", "Роман", "Фёдор", "Марк", "Степан", "Юрий",
+    "Семён", "Виктор", "Андрей", "Михаил",
+]
+LAST_NAMES = [
+    "Дорожко", "Дронов", "Кравцов", "Свечников", "Голышев", "Шипачёв", "Мичков",
+    "Капризов", "Панарин", "Гусев", "Орлов", "Волков", "Кузнецов", "Морозов",
+    "Лебедев", "Козлов", "Новиков", "Павлов", "Семенов", "Попов", "Васильев",
+    "Зайцев", "Федоров", "Никитин", "Белов", "Тарасов", "Жуков", "Комаров",
+]
+# Только имена, которые проходят is_valid_player, иначе они выпадут из составов
+PLAYER_NAMES = [
+    name
+    for name in (f"{first} {last}" for first, last in product(FIRST_NAMES, LAST_NAMES))
+    if is_valid_player(name)
+]
+LINEUP_SIZE = 20
+POSITIONS = ["вр"] * 2 + ["зщ"] * 7 + ["нп"] * 11
+POSITION_NAMES = {"нп": "Нападающий", "вр": "Вратарь", "зщ": "Защитник"}
+# Сколько разных составов переиспользуется в synthetic_matches
+LINEUP_POOL = 1000
+MATCHES_PER_DAY = 8
+
+# Ссылки на живой сайт в записанных страницах заменяются на локальные
+SITE_URL_RE = re.compile(r"https?://(?:[\w-]+\.)*championat\.com")
+SCRIPT_RE = re.compile(r"<script\b.*?</script>", re.S | re.I)
+
+
+def _day_item(match_path, time_text, team1, team2, score1, score2):
+    return (
+        f'<div class="results-item"><a class="results-item__link" href="{match_path}">'
+        f'<span class="results-item__time">{time_text}</span> '
+        f'<span class="results-item__team">{escape(team1)}</span> <span>–</span> '
+        f'<span class="results-item__team">{escape(team2)}</span> '
+        f'<span class="results-item__result">{score1} : {score2}</span> '
+        f'<span class="results-item__status">окончен</span></a></div>'
+    )
+
+
+def _match_page(rng, score1, score2):
+    names = rng.sample(PLAYER_NAMES, LINEUP_SIZE * 2)
+    positions = POSITIONS + POSITIONS
+    rows = "".join(
+        f'<tr><td class="table-item__name">{name}</td>'
+        f'<td class="table-item__amplua">{position}</td></tr>'
+        for name, position in zip(names, positions)
+    )
+    scorers = rng.choices(names[:LINEUP_SIZE], k=score1) + rng.choices(
+        names[LINEUP_SIZE:], k=score2
+    )
+    goals = "".join(f'<div class="match-stat__player">{name}</div>' for name in scorers)
+    stadium, city, capacity = rng.choice(STADIUMS)
+    viewers = rng.randint(capacity // 2, capacity)
+    extra = (
+        '<div class="match-info__extra-row">Главный судья: Иван Иванов</div>'
+        f'<div class="match-info__extra-row">Стадион: <a href="/stadium/1/">{stadium}</a> '
+        f"({city}, Россия), зрителей {viewers} ({viewers * 100 // capacity}%) {capacity}</div>"
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>Матч</title></head><body>"
+        f'<div class="match-info">{extra}</div><table class="lineups">{rows}</table>'
+        f'<div class="match-stat">{goals}</div></body></html>'
+    )
+
+
+def synthetic_fixtures(days, matches_per_day, league="_superleague", seed=0):
+    """
+    Синтетические страницы в разметке championat.com.
+    Возвращает {"days": [HTML списка матчей дня, от новых к старым],
+    "pages": {путь страницы матча: HTML}}.
+    """
+    rng = random.Random(seed)
+    fixtures = {"days": [], "pages": {}}
+    for day in range(days):
+        items = []
+        for i in range(matches_per_day):
+            path = f"/hockey/{league}/tournament/1/match/{day * 10000 + i}/"
+            team1, team2 = rng.sample(CLUBS, 2)
+            score1, score2 = rng.randint(0, 5), rng.randint(0, 5)
+            time_text = f"{rng.randint(10, 21)}:{rng.choice(['00', '15', '30', '45'])}"
+            items.append(_day_item(path, time_text, team1, team2, score1, score2))
+            fixtures["pages"][path] = _match_page(rng, score1, score2)
+        fixtures["days"].append('<div class="results">' + "".join(items) + "</div>")
+    return fixtures
+
+
+def sanitize(html):
+    """Убирает скрипты и ссылки на живой сайт из записанной страницы"""
+    return SITE_URL_RE.sub("", SCRIPT_RE.sub("", html))
+
+
+def snapshot_fixtures(root=SNAPSHOT_DIR):
+    """Страницы из снимков (runner(snapshots=True)) в формате synthetic_fixtures"""
+    snapshots = SnapshotStore(root)
+    day_index = snapshots.index(DAY_KIND)
+
+    def day_date(url):
+        try:
+            return datetime.strptime(url.rsplit("#", 1)[1], "%Y-%m-%d")
+        except (IndexError, ValueError):
+            return datetime.min
+
+    fixtures = {"days": [], "pages": {}}
+    for url in sorted(day_index, key=day_date, reverse=True):
+        fixtures["days"].append(sanitize(load_snapshot(root, day_index[url])))
+    for url, digest in snapshots.index(MATCH_KIND).items():
+        fixtures["pages"][urlsplit(url).path] = sanitize(load_snapshot(root, digest))
+    return fixtures
+
+
+def synthetic_matches(count, seed=0, first_day=date(2025, 11, 11)):
+    """
+    Генерирует count матчей в формате matches_data.json (как их пишет runner),
+    по MATCHES_PER_DAY матчей на день, от first_day назад.
+    Составы берутся из пула LINEUP_POOL готовых списков: в JSON каждый
+    матч получает полный состав, а в памяти генератор остается небольшим
+    даже на миллионе матчей.
+    """
+    rng = random.Random(seed)
+    lineups = []
+    for _ in range(LINEUP_POOL):
+        names = rng.sample(PLAYER_NAMES, LINEUP_SIZE * 2)
+        lineups.append(
+            [
+                [
+                    {"name": name, "position": POSITION_NAMES[position]}
+                    for name, position in zip(names[team::2], POSITIONS)
+                ]
+                for team in (0, 1)
+            ]
+        )
+
+    for i in range(count):
+        day = first_day - timedelta(days=i // MATCHES_PER_DAY)
+        team1, team2 = rng.sample(CLUBS, 2)
+        score1, score2 = rng.randint(0, 5), rng.randint(0, 5)
+        lineup_team1, lineup_team2 = rng.choice(lineups)
+        stadium, city, capacity = rng.choice(STADIUMS)
+        viewers = rng.randint(capacity // 2, capacity)
+        text = (
+            f"{rng.randint(10, 21)}:{rng.choice(['00', '15', '30', '45'])} "
+            f"{team1} – {team2} {score1} : {score2} окончен"
+        )
+        yield {
+            "text": text,
+            "team1": team1,
+            "team2": team2,
+            "score": f"{score1}:{score2}",
+            "url": f"https://www.championat.com/hockey/_superleague/tournament/1/match/{i}/",
+            "source_url": f"https://www.championat.com/stat/hockey/#{day.isoformat()}",
+            "stats": {
+                "stadion": stadium,
+                "city": city,
+                "viewers": viewers,
+                "attendance_percent": viewers * 100 // capacity,
+                "max_capacity": capacity,
+                "lineup_team1": lineup_team1,
+                "lineup_team2": lineup_team2,
+                "goals_team1": [p["name"] for p in rng.choices(lineup_team1, k=score1)],
+                "goals_team2": [p["name"] for p in rng.choices(lineup_team2, k=score2)],
+                "kick_offs": [],
+            },
+        }
@@ -0,0 +1,106 @@
+import threading
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Страница /stat/hockey/ на сайте строится скриптом по дате из #фрагмента,
+# который не доходит до сервера. Заглушка делает то же самое:
+# подгружает список матчей дня и вставляет его в страницу.
+DAY_SHELL = """<!DOCTYPE html>
+<html><head><title>Хоккей</title></head><body>
+<div id="results"></div>
+<script>
+fetch('/_fixtures/day/' + location.hash.slice(1))
+    .then((response) => response.text())
+    .then((html) => { document.getElementById('results').innerHTML = html; });
+</script>
+</body></html>
+"""
+
+
+class StandInServer:
+    """
+    Локальный HTTP-сервер вместо championat.com для бенчмарков.
+    fixtures - {"days": [...], "pages": {...}} из benchmarks/fixtures.py.
+    День today - 1 отдается первой страницей fixtures["days"], today - 2 -
+    второй и т.д., как их запрашивает runner.
+    Считает отданные страницы дней и матчей.
+    """
+
+    def __init__(self, fixtures, today=None, host="127.0.0.1", port=0):
+        self.fixtures = fixtures
+        self.today = today or date.today()
+        self.counts = {"day": 0, "match": 0, "not_found": 0}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, kind):
+        with self._lock:
+            self.counts[kind] += 1
+
+    def day_html(self, day_text):
+        try:
+            day = datetime.strptime(day_text, "%Y-%m-%d").date()
+        except ValueError:
+            return None
+        index = (self.today - day).days - 1
+        if 0 <= index < len(self.fixtures["days"]):
+            return self.fixtures["days"][index]
+        return None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status, body):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/stat/hockey/":
+                    self._send(200, DAY_SHELL)
+                    return
+                if path.startswith("/_fixtures/day/"):
+                    html = server.day_html(path.rsplit("/", 1)[1])
+                    kind = "day"
+                else:
+                    html = server.fixtures["pages"].get(path)
+                    kind = "match"
+                if html is None:
+                    server._count("not_found")
+                    self._send(404, "Not found")
+                    return
+                server._count(kind)
+                self._send(200, html)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -1,4 +1,9 @@
+import argparse
+import os
 from tools.generate_urls_to_parse import runner
+from tools.reparse import reparse
+from tools.json_tools.match_store import get_match_store
+from tools.read_data_from_page import ENGINES, DEFAULT_ENGINE
 
 league_map = {
     "1": "_superleague",
@@ -14,7 +19,44 @@ league_map = {
 }
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Парсер хоккейных матчей")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Сколько дней парсить одновременно (по умолчанию спрашивается)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default=DEFAULT_ENGINE,
+        help="Как загружать страницы матчей: браузером или HTTP-запросами",
+    )
+    parser.add_argument(
+        "--snapshots",
+        action="store_true",
+        help="Сохранять сжатый HTML загруженных страниц для --reparse",
+    )
+    parser.add_argument(
+        "--reparse",
+        action="store_true",
+        help="Пересобрать json и базу из сохраненных снимков страниц, без сети",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Переписать хранилище матчей без дубликатов и поврежденных строк",
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    if args.compact:
+        matches = get_match_store().compact()
+        print(f"Хранилище сжато, матчей: {matches}")
+        return
     while True:
         league = input(
             "Введите лигу для парсинга \n1)'khl\n2)'nhl'\n3)'vhl'\n4)'mhl'\n5)'all'\n"
@@ -30,6 +72,9 @@ def main():
             break
         else:
             print("Лига не может быть пустой. Пожалуйста, введите корректное значение.")
+    if args.reparse:
+        reparse(league=league)
+        return
     while True:
         days = input("Введите количество дней для парсинга (например, 7): ").strip()
         if days.isdigit() and int(days) > 0:
@@ -37,7 +82,25 @@ def main():
             break
         else:
             print("Пожалуйста, введите корректное положительное число для дней.")
-    runner(days=days, league=league)
+    workers = args.workers
+    while workers is None:
+        default_workers = min(os.cpu_count() or 1, 4)
+        value = input(
+            f"Введите количество параллельных браузеров (Enter - {default_workers}): "
+        ).strip()
+        if not value:
+            workers = default_workers
+        elif value.isdigit() and int(value) > 0:
+            workers = int(value)
+        else:
+            print("Пожалуйста, введите корректное положительное число.")
+    runner(
+        days=days,
+        league=league,
+        workers=workers,
+        engine=args.engine,
+        snapshots=args.snapshots,
+    )
 
 
 if __name__ == "__main__":
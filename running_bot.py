@@ -1,5 +1,6 @@
 import shutil
 from tg_tools.bot import *
+from tools.cache_tools.cache_db import get_cache_db
 
 
 if not os.path.exists("./tg_tools/token.py"):
@@ -11,15 +12,11 @@ else:
         _token = str(file.read())
 
 
-folder_path = './cache'
-for filename in os.listdir(folder_path):
-    file_path = os.path.join(folder_path, filename)
-    try:
-        if os.path.isfile(file_path):
-            os.remove(file_path)
-    except Exception as e:
-        print(f"Failed to delete {file_path}: {e}")
-        
+# Кэш не очищается целиком: оконченные матчи не меняются, а свежие
+# записи сами устаревают по TTL (см. tools/cache_tools/cache_policy.py)
+removed = get_cache_db().purge_expired()
+print(f"Удалено устаревших записей кэша: {removed}")
+
 if __name__ == "__main__":
     first_et = tg_bot(token_bot=_token)
     first_et.run()
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+Дозапись матчей в базу, перешедшую со старых версий схемы: история
+не теряется, а матчи без URL не дублируются.
+
+    python -m unittest tests.test_generate_db
+"""
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from tools.database_tools.generate_db import create_hockey_database
+from tools.database_tools.schema import SCHEMA_VERSION, migrate_database
+
+# Схема hockey_matches.db до версий: без url, match_date и ограничений
+BASELINE_SCHEMA = """
+CREATE TABLE teams (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE);
+CREATE TABLE players (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL);
+CREATE TABLE matches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    match_text TEXT,
+    match_time TEXT,
+    team1_id INTEGER NOT NULL,
+    team2_id INTEGER NOT NULL,
+    score TEXT,
+    stadium_id INTEGER,
+    viewers INTEGER,
+    attendance_percent INTEGER
+);
+CREATE TABLE match_lineups (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    match_id INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    position TEXT
+);
+CREATE TABLE stadiums (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    city TEXT NOT NULL,
+    max_capacity INTEGER
+);
+"""
+
+OLD_ONLY_TEXT = "17:00 Амур – Сибирь 3 : 1 окончен"
+SHARED_TEXT = "19:30 Трактор – Лада 2 : 0 окончен"
+NEW_TEXT = "19:00 СКА – ЦСКА 1 : 4 окончен"
+
+
+def make_match(text, team1, team2, score, number, day="2025-11-10"):
+    return {
+        "text": text,
+        "team1": team1,
+        "team2": team2,
+        "score": score,
+        "url": f"https://www.championat.com/hockey/_superleague/tournament/1/match/{number}/",
+        "source_url": f"https://www.championat.com/stat/hockey/#{day}",
+        "stats": {
+            "stadion": "Арена-2000",
+            "city": "Ярославль",
+            "viewers": 8000,
+            "attendance_percent": 88,
+            "max_capacity": 9000,
+            "lineup_team1": [{"name": "Максим Дронов", "position": "Вратарь"}],
+            "lineup_team2": [{"name": "Егор Кравцов", "position": "Защитник"}],
+            "goals_team1": [],
+            "goals_team2": [],
+            "kick_offs": [],
+        },
+    }
+
+
+class IncrementalMergeAfterMigrationTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="parser_db_test_")
+        self.db_path = os.path.join(self.workdir, "hockey_matches.db")
+        self.json_path = os.path.join(self.workdir, "matches_data.json")
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "matches": [
+                        make_match(SHARED_TEXT, "Трактор", "Лада", "2:0", 1),
+                        make_match(NEW_TEXT, "СКА", "ЦСКА", "1:4", 2),
+                    ]
+                },
+                f,
+                ensure_ascii=False,
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def make_baseline_db(self):
+        """База исходной схемы с двумя матчами, один из них есть и в JSON"""
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(BASELINE_SCHEMA)
+        conn.executemany(
+            "INSERT INTO teams(name) VALUES (?)",
+            [("Амур",), ("Сибирь",), ("Трактор",), ("Лада",)],
+        )
+        conn.execute("INSERT INTO players(name) VALUES ('Павел Орлов')")
+        conn.executemany(
+            """INSERT INTO matches(match_text, match_time, team1_id, team2_id, score)
+               VALUES (?, ?, ?, ?, ?)""",
+            [(OLD_ONLY_TEXT, "17:00", 1, 2, "3:1"), (SHARED_TEXT, "19:30", 3, 4, "2:0")],
+        )
+        conn.execute(
+            "INSERT INTO match_lineups(match_id, team_id, player_id, position) VALUES (1, 1, 1, 'Вратарь')"
+        )
+        conn.commit()
+        conn.close()
+
+    def make_v2_db(self):
+        """База версии 2: URL есть, колонки match_date еще нет"""
+        create_hockey_database(self.json_path, self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DROP INDEX idx_matches_date")
+        conn.execute("ALTER TABLE matches DROP COLUMN match_date")
+        conn.execute("PRAGMA user_version = 2")
+        conn.commit()
+        conn.close()
+
+    def rows(self, sql):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(sql).fetchall()
+        finally:
+            conn.close()
+
+    def test_baseline_db_keeps_history_and_links_urls(self):
+        self.make_baseline_db()
+        migrate_database(self.db_path)
+
+        self.assertEqual(create_hockey_database(self.json_path, self.db_path, incremental=True), 1)
+        # Повторная дозапись тех же матчей ничего не добавляет
+        self.assertEqual(create_hockey_database(self.json_path, self.db_path, incremental=True), 0)
+
+        matches = self.rows("SELECT id, match_text, url, match_date FROM matches ORDER BY id")
+        self.assertEqual([row[1] for row in matches], [OLD_ONLY_TEXT, SHARED_TEXT, NEW_TEXT])
+        self.assertIsNone(matches[0][2])
+        self.assertTrue(matches[1][2].endswith("/match/1/"))
+        self.assertEqual(matches[1][3], "2025-11-10")
+        self.assertTrue(matches[2][2].endswith("/match/2/"))
+        # Состав старого матча на месте
+        self.assertEqual(
+            self.rows("SELECT COUNT(*) FROM match_lineups WHERE match_id = 1"), [(1,)]
+        )
+        self.assertEqual(self.rows("PRAGMA user_version"), [(SCHEMA_VERSION,)])
+
+    def test_v2_db_merges_without_duplicates(self):
+        self.make_v2_db()
+        migrate_database(self.db_path)
+
+        self.assertEqual(create_hockey_database(self.json_path, self.db_path, incremental=True), 0)
+        self.assertEqual(
+            self.rows("SELECT COUNT(*), COUNT(DISTINCT url) FROM matches"), [(2, 2)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
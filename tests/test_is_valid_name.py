@@ -0,0 +1,204 @@
+"""
+Дифференциальная проверка предкомпилированной валидации имен:
+is_valid_player и filter_lineup_names должны давать ровно тот же результат,
+что и исходные реализации, замороженные ниже, на сгенерированном корпусе.
+
+    python -m unittest tests.test_is_valid_name
+"""
+import random
+import re
+import unittest
+from tools.is_valid_name import (
+    BLACKLIST,
+    TEAMS,
+    filter_lineup_names,
+    is_valid_player,
+    validate_many,
+    _is_valid_player_cached,
+)
+
+CORPUS_SEED = 20251111
+CORPUS_SIZE = 20000
+LINEUPS = 2000
+
+
+# Исходная проверка имени до предкомпиляции, без изменений
+
+
+def _old_check_basic_string_format(name):
+    if not name or len(name) < 3 or len(name) > 50:
+        return False
+    return True
+
+
+def _old_check_invalid_characters(name):
+    if any(char.isdigit() for char in name):
+        return True
+    if re.search(r'[!@#$%^&*()_+=\[\]{};:"\\|,<>/?]', name):
+        return True
+    return False
+
+
+def _old_parse_name_words(name):
+    if " " not in name:
+        return [name]
+    return name.split()
+
+
+def _old_validate_word_structure(name):
+    words = _old_parse_name_words(name)
+    if len(words) < 1 or len(words) > 4:
+        return False
+    for word in words:
+        if len(word) < 1:
+            return False
+        if len(word) > 20:
+            return False
+    return True
+
+
+def _old_check_against_blacklist(name):
+    lower_name = name.lower()
+    for banned in BLACKLIST:
+        if banned in lower_name:
+            return True
+    return False
+
+
+def old_is_valid_player(name):
+    try:
+        name = name.strip()
+        if not _old_check_basic_string_format(name):
+            return False
+        if _old_check_invalid_characters(name):
+            return False
+        if not _old_validate_word_structure(name):
+            return False
+        if _old_check_against_blacklist(name):
+            return False
+        if name in TEAMS:
+            return False
+        if len(name) <= 4 and name.isupper():
+            return False
+        return True
+    except Exception:
+        return False
+
+
+# Исходный отбор имен состава из build_match_stats, без изменений
+OLD_TEAM_WORDS = [
+    "торпедо", "акм", "ростов", "динамо", "химик", "рязань",
+    "металлург", "дизель", "горняк", "югра", "магнитка",
+]
+
+
+def old_filter_lineup_names(names):
+    player_names = []
+    for text in names:
+        if (
+            text
+            and old_is_valid_player(text)
+            and len(text) >= 3
+            and len(text.split()) < 3
+        ):
+            if text not in TEAMS and not any(
+                team_word in text.lower() for team_word in OLD_TEAM_WORDS
+            ):
+                player_names.append(text)
+    return player_names
+
+
+FIRST_NAMES = [
+    "Максим", "Егор", "Илья", "Артём", "Кирилл", "Денис", "Павел", "Антон",
+    "Олег", "Глеб", "Логан", "Джош", "Ник", "Ли", "Ян",
+]
+LAST_NAMES = [
+    "Дорожко", "Дронов", "Кравцов", "Шипачёв", "Капризов", "Дэй", "Ливо",
+    "Торпедов", "Динамов", "Химиков", "Сокол", "Барсуков", "Звездин", "Нкемди",
+    "Вриз", "Оглы-Заде", "Де Ла Роса",
+]
+NOISE = [
+    "", " ", "нп", "вр", "зщ", "ВР", "СКА", "АКМ", "окончен", "Матч центр",
+    "1-й период", "Счёт 2:1", "Игрок #17", "a@b", "Иван (к)", "Петров, мл.",
+    "Очень Длинное Имя Которое Не Подходит Ни Под Что",
+    "Сверхдлиннаяфамилиякотораянепроходит",
+]
+
+
+def _random_word(rng):
+    letters = "абвгдеёжзийклмнопрстуфхцчшщыэюяABCXYZ"
+    word = "".join(rng.choice(letters) for _ in range(rng.randint(1, 24)))
+    return word.capitalize() if rng.random() < 0.7 else word.upper()
+
+
+def _random_name(rng):
+    kind = rng.random()
+    if kind < 0.45:
+        return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    if kind < 0.55:
+        return rng.choice(TEAMS)
+    if kind < 0.65:
+        return f"{rng.choice(FIRST_NAMES)} {rng.choice(BLACKLIST).capitalize()}"
+    if kind < 0.75:
+        return rng.choice(NOISE)
+    if kind < 0.85:
+        return " ".join(_random_word(rng) for _ in range(rng.randint(1, 5)))
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    # Пробелы по краям, цифры и спецсимволы в случайном месте
+    position = rng.randint(0, len(name))
+    return rng.choice(["  ", "\t", "7", "!", "/", "ё"]).join(
+        [name[:position], name[position:]]
+    ) + rng.choice(["", " ", "\n"])
+
+
+def make_corpus(seed=CORPUS_SEED, size=CORPUS_SIZE):
+    rng = random.Random(seed)
+    return [_random_name(rng) for _ in range(size)]
+
+
+class IsValidNameDifferentialTest(unittest.TestCase):
+    def setUp(self):
+        _is_valid_player_cached.cache_clear()
+        self.corpus = make_corpus()
+
+    def test_corpus_covers_both_outcomes(self):
+        results = [old_is_valid_player(name) for name in self.corpus]
+        self.assertGreater(results.count(True), len(results) // 10)
+        self.assertGreater(results.count(False), len(results) // 10)
+
+    def test_is_valid_player_matches_original(self):
+        for name in self.corpus:
+            self.assertEqual(is_valid_player(name), old_is_valid_player(name), repr(name))
+
+    def test_repeated_names_hit_cache_with_same_result(self):
+        first = [is_valid_player(name) for name in self.corpus]
+        second = [is_valid_player(name) for name in self.corpus]
+        self.assertEqual(first, second)
+        self.assertGreater(_is_valid_player_cached.cache_info().hits, 0)
+
+    def test_non_string_names_are_rejected(self):
+        for name in (None, 17, b"Ivan Petrov"):
+            self.assertEqual(is_valid_player(name), old_is_valid_player(name))
+
+    def test_validate_many_matches_original(self):
+        self.assertEqual(
+            validate_many(self.corpus),
+            [old_is_valid_player(name) for name in self.corpus],
+        )
+
+    def test_filter_lineup_names_matches_original(self):
+        rng = random.Random(CORPUS_SEED + 1)
+        for _ in range(LINEUPS):
+            names = rng.sample(self.corpus, rng.randint(0, 50)) + [None] * rng.randint(0, 1)
+            rng.shuffle(names)
+            expected = old_filter_lineup_names(names)
+            actual = filter_lineup_names(names)
+            self.assertEqual(actual, expected)
+            # Сравнение до байта: те же строки в том же порядке
+            self.assertEqual(
+                "\0".join(actual).encode("utf-8"), "\0".join(expected).encode("utf-8")
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
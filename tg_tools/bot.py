@@ -1,6 +1,9 @@
 import asyncio
 import os
+import shutil
 import signal
+import time
+from functools import partial
 import warnings
 from telegram.warnings import PTBUserWarning
 from tg_tools.sm import dev_profile
@@ -8,15 +11,45 @@ from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, ConversationHandler, CallbackQueryHandler
 from telegram.error import TelegramError
 from tools.generate_urls_to_parse import runner
+from tools.database_tools.generate_db import create_hockey_database, DB_PATH
+from tools.database_tools.queries import get_match_queries, DEFAULT_LIMIT
+from tools.database_tools.schema import migrate_database
+from tg_tools.job_executor import JobExecutor, QueueFullError
+from tg_tools.chat_progress import ChatProgress
+from tg_tools.delivery import DeliveryLog, MODES, prepare_delivery
 
 # Suppress the specific per_message warning
 warnings.filterwarnings('ignore', message='.*per_message.*', category=PTBUserWarning)
 
 DATA, MODE, LEAGUE = range(3)
+# Каждая задача парсинга пишет в свой каталог, чтобы параллельные задачи не портили файлы
+JOBS_DIR = "./jobs"
+JOB_OUTPUT_TTL = 60 * 60
+
+
+def format_match(match):
+    date = match["match_date"] or "????-??-??"
+    line = f"{date} {match['match_time'] or ''} {match['team1']} – {match['team2']} {match['score'] or ''}"
+    if match["stadium"]:
+        line += f" ({match['stadium']}"
+        line += f", {match['viewers']} viewers)" if match["viewers"] else ")"
+    return " ".join(line.split())
+
+
 class tg_bot:
     def __init__(self, token_bot):
         self.token_bot = token_bot
         self.application = None
+        # Парсинг идет в отдельных процессах, event loop бота остается свободным
+        self.jobs = JobExecutor()
+        # Каталоги задач, результаты которых еще отправляются
+        self.active_dirs = set()
+        # Результаты задач дописываются в основную базу, по ней отвечают /team, /player, ...
+        self.queries = get_match_queries()
+        self.merge_lock = asyncio.Lock()
+        self.merged_dirs = set()
+        # Какие матчи уже отправлены в каждый чат, для выгрузки только новых
+        self.deliveries = DeliveryLog()
     # Tools commands
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(dev_profile)
@@ -26,14 +59,108 @@ class tg_bot:
         
     async def options(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         pass
+
+    async def status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        job = self.jobs.status(update.effective_chat.id)
+        if job is None:
+            await update.message.reply_text("No parse jobs yet. Use /parse to start one.")
+            return
+        icons = {"queued": "⏳", "running": "🔄", "done": "✅", "failed": "❌"}
+        text = f"{icons[job['status']]} {job['status']}: {job['description']}"
+        if job["shared_with"]:
+            text += f"\nShared with {job['shared_with']} other chat(s)"
+        if job["error"]:
+            text += f"\nError: {job['error']}"
+        text += f"\n\nJobs in queue: {self.jobs.pending}"
+        await update.message.reply_text(text)
             
             
+    # Query commands: answered from hockey_matches.db, no parsing
+    async def reply_query(self, update, result, render):
+        if result is None:
+            await update.message.reply_text("📭 No database yet. Use /parse to collect matches first.")
+        elif "candidates" in result:
+            if result["candidates"]:
+                await update.message.reply_text("🔎 Did you mean:\n" + "\n".join(result["candidates"]))
+            else:
+                await update.message.reply_text("🔎 Nothing found.")
+        else:
+            await update.message.reply_text(render(result))
+
+    @staticmethod
+    def render_matches(title, matches):
+        lines = [title] + [format_match(match) for match in matches]
+        if not matches:
+            lines.append("No matches yet.")
+        return "\n".join(lines)
+
+    async def team(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        name = " ".join(context.args)
+        if not name:
+            await update.message.reply_text("Usage: /team <team name>")
+            return
+        await self.reply_query(
+            update,
+            self.queries.team_results(name),
+            lambda r: self.render_matches(f"🏒 {r['name']}: last matches", r["matches"]),
+        )
+
+    async def player(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        name = " ".join(context.args)
+        if not name:
+            await update.message.reply_text("Usage: /player <player name>")
+            return
+        await self.reply_query(
+            update,
+            self.queries.player_appearances(name),
+            lambda r: self.render_matches(
+                f"👤 {r['name']} ({', '.join(r['positions']) or 'unknown position'}): "
+                f"{r['total']} match(es)",
+                [dict(m, team1=f"[{m['player_team']}] {m['team1']}") for m in r["matches"]],
+            ),
+        )
+
+    async def stadium(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        name = " ".join(context.args)
+        if not name:
+            await update.message.reply_text("Usage: /stadium <stadium name>")
+            return
+        await self.reply_query(
+            update,
+            self.queries.stadium_attendance(name),
+            lambda r: self.render_matches(
+                f"🏟 {r['name']}, {r['city']} (capacity {r['max_capacity'] or '?'})\n"
+                f"Matches: {r['matches']}, average viewers: {r['avg_viewers'] or '?'}, "
+                f"max: {r['max_viewers'] or '?'}, average fill: {r['avg_percent'] or '?'}%",
+                r["matches_list"],
+            ),
+        )
+
+    async def last(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        limit = DEFAULT_LIMIT
+        if context.args:
+            if not context.args[0].isdigit():
+                await update.message.reply_text("Usage: /last [number of matches]")
+                return
+            limit = int(context.args[0])
+        matches = self.queries.last_matches(limit)
+        await self.reply_query(
+            update,
+            None if matches is None else {"matches": matches},
+            lambda r: self.render_matches("🕒 Last matches", r["matches"]),
+        )
+
     async def info(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         info_text = """
 🤖 Available Commands:
 
 /start - Show main menu
 /parse - Parse and get data
+/status - Show your parse job status
+/team <name> - Last matches of a team
+/player <name> - Player appearances
+/stadium <name> - Stadium attendance
+/last [N] - Last N matches
 /info - Show this help
 /cancel - Cancel current operation
         """
@@ -48,7 +175,7 @@ class tg_bot:
         
         button_data = query.data  
         
-        if button_data in ['json', 'db', 'both']:
+        if button_data in MODES:
             context.user_data['mode'] = button_data
             await query.edit_message_text(f"✓ Selected format: {button_data}")
             
@@ -92,6 +219,11 @@ class tg_bot:
             await application.bot.set_my_commands([
                 ("start", "Show main menu"),
                 ("parse", "Parse to JSON/DB/both"),
+                ("status", "Show parse job status"),
+                ("team", "Last matches of a team"),
+                ("player", "Player appearances"),
+                ("stadium", "Stadium attendance"),
+                ("last", "Last matches"),
                 ("info", "Show commands"),
                 ("cancel", "Cancel operation"),
             ])
@@ -102,37 +234,90 @@ class tg_bot:
         return DATA
 
 
+    async def post_shutdown(self, application: Application):
+        self.jobs.shutdown()
+
+    def cleanup_job_dirs(self):
+        """Удаляет каталоги завершенных задач старше JOB_OUTPUT_TTL"""
+        if not os.path.isdir(JOBS_DIR):
+            return
+        for name in os.listdir(JOBS_DIR):
+            path = os.path.join(JOBS_DIR, name)
+            if path in self.active_dirs:
+                continue
+            if time.time() - os.path.getmtime(path) > JOB_OUTPUT_TTL:
+                shutil.rmtree(path, ignore_errors=True)
+                self.merged_dirs.discard(path)
+
+    async def merge_into_main_db(self, paths):
+        """Дописывает матчи задачи в основную базу, один раз на задачу"""
+        job_dir = os.path.dirname(paths["json"])
+        async with self.merge_lock:
+            if job_dir in self.merged_dirs:
+                return
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(
+                    None,
+                    partial(create_hockey_database, paths["json"], DB_PATH, incremental=True),
+                )
+                self.merged_dirs.add(job_dir)
+            except Exception as e:
+                print(f"Failed to merge {paths['json']} into {DB_PATH}: {e}")
+
     async def run_parser_and_send_file(self, chat_id, mode, days,league):
+        self.cleanup_job_dirs()
+        output_dir = os.path.join(JOBS_DIR, f"{days}_{league}_{time.time_ns()}")
+        self.active_dirs.add(output_dir)
         try:
-            runner(days=days,league=league)
-            await self.send_parser_results(chat_id, mode)
+            # Одинаковые (days, league) запросы, пришедшие пока идет парсинг,
+            # получают результат уже запущенной задачи
+            paths = await self.jobs.run(
+                chat_id,
+                partial(runner, days=days, league=league, output_dir=output_dir),
+                key=(days, league),
+                description=f"{days} days, {league.upper()}",
+                on_progress=ChatProgress(self.application.bot, chat_id),
+            )
+            await self.merge_into_main_db(paths)
+            await self.send_parser_results(chat_id, mode, paths)
+        except QueueFullError:
+            await self.application.bot.send_message(
+                chat_id=chat_id,
+                text="⏳ Too many parse jobs right now, please try again later."
+            )
         except Exception as e:
             print(f"Parser error details: {e}")
             await self.application.bot.send_message(
                 chat_id=chat_id,
                 text=f"❌ Parser failed with error: {str(e)}"
             )
+        finally:
+            self.active_dirs.discard(output_dir)
 
-    async def send_parser_results(self, chat_id, mode):
+    async def send_parser_results(self, chat_id, mode, paths):
         try:
             await self.application.bot.send_message(
                 chat_id=chat_id,
                 text="✅ Parsing completed successfully! Sending results..."
             )
             
-            if mode == 'json':
-                files_to_send = [('matches_data.json', 'Parsed matches data (JSON)')]
-            elif mode == 'db':
-                files_to_send = [('hockey_matches.db', 'Database with statistics')]
-            else:   
-                files_to_send = [
-                    ('matches_data.json', 'Parsed matches data (JSON)'),
-                    ('hockey_matches.db', 'Database with statistics'),
-                ]
-            
-            for filename, description in files_to_send:
-                if os.path.exists(filename):
-                    with open(filename, 'rb') as file:
+            # Чтение JSON и сжатие - в отдельном потоке, чтобы не блокировать бота
+            loop = asyncio.get_running_loop()
+            files_to_send, urls = await loop.run_in_executor(
+                None, partial(prepare_delivery, chat_id, mode, paths, self.deliveries)
+            )
+            if not files_to_send:
+                await self.application.bot.send_message(
+                    chat_id=chat_id,
+                    text="📭 No new matches since your last request."
+                )
+                return
+
+            all_sent = True
+            for path, filename, description in files_to_send:
+                if os.path.exists(path):
+                    with open(path, 'rb') as file:
                         await self.application.bot.send_document(
                             chat_id=chat_id,
                             document=file,
@@ -140,10 +325,15 @@ class tg_bot:
                             caption=description
                         )
                 else:
+                    all_sent = False
                     await self.application.bot.send_message(
                         chat_id=chat_id,
                         text=f"⚠️ File {filename} not found"
                     )
+            if all_sent:
+                await loop.run_in_executor(
+                    None, partial(self.deliveries.mark_delivered, chat_id, urls)
+                )
             
             await self.application.bot.send_message(
                 chat_id=chat_id,
@@ -176,6 +366,8 @@ class tg_bot:
             [InlineKeyboardButton("JSON", callback_data='json')],
             [InlineKeyboardButton("DB file", callback_data='db')],
             [InlineKeyboardButton("Both", callback_data='both')],
+            [InlineKeyboardButton("Both, compressed (.gz)", callback_data='gzip')],
+            [InlineKeyboardButton("New since my last request (.gz)", callback_data='delta')],
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         await update.message.reply_text('Choose output format:', reply_markup=reply_markup)
@@ -187,6 +379,9 @@ class tg_bot:
    
 
     def main(self):
+        # Запросы читают базу только на чтение, поэтому схему обновляем один раз при запуске
+        if os.path.exists(DB_PATH):
+            migrate_database(DB_PATH)
         self.application = Application.builder().token(self.token_bot).build()
         
         # Conversation handler with proper callback handling
@@ -205,10 +400,16 @@ class tg_bot:
         self.application.add_handler(CommandHandler("start", self.start))
         self.application.add_handler(CommandHandler("exit", self.exit))
         self.application.add_handler(CommandHandler("info", self.info))
+        self.application.add_handler(CommandHandler("status", self.status))
+        self.application.add_handler(CommandHandler("team", self.team))
+        self.application.add_handler(CommandHandler("player", self.player))
+        self.application.add_handler(CommandHandler("stadium", self.stadium))
+        self.application.add_handler(CommandHandler("last", self.last))
         self.application.add_handler(conv_handler)
         
         
         self.application.post_init = self.post_init
+        self.application.post_shutdown = self.post_shutdown
         self.application.run_polling(allowed_updates=Update.ALL_TYPES)
 
     def run(self):
@@ -0,0 +1,90 @@
+import time
+from telegram.error import TelegramError
+from tools.progress import (
+    DAY_FINISHED,
+    MATCH_PARSED,
+    CACHE_HIT,
+    STAGE_STARTED,
+    STAGE_FINISHED,
+)
+
+# Не чаще одного редактирования сообщения о прогрессе за столько секунд
+PROGRESS_INTERVAL = 3
+
+STAGE_NAMES = {
+    "scrape": "Parsing pages",
+    "export_json": "Exporting JSON",
+    "database": "Building database",
+}
+
+
+class ChatProgress:
+    """
+    Показывает ход задачи парсинга в чате одним сообщением, которое
+    редактируется по мере прихода событий, но не чаще PROGRESS_INTERVAL.
+    Начало и конец этапов показываются сразу.
+    Экземпляр передается в JobExecutor.run как on_progress.
+    """
+
+    def __init__(self, bot, chat_id, interval=PROGRESS_INTERVAL):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.interval = interval
+        self.message_id = None
+        self.last_sent = 0
+        self.last_text = None
+        self.days = 0
+        self.days_done = 0
+        self.matches = 0
+        self.parsed = 0
+        self.cache_hits = 0
+        self.stage = None
+        self.stages = {}
+
+    def update(self, event):
+        kind = event["event"]
+        if kind == DAY_FINISHED:
+            self.days = event["days"]
+            self.days_done += 1
+            self.matches += event["matches"]
+        elif kind == MATCH_PARSED:
+            self.parsed += 1
+        elif kind == CACHE_HIT:
+            self.cache_hits += 1
+        elif kind == STAGE_STARTED:
+            self.stage = event["stage"]
+        elif kind == STAGE_FINISHED:
+            self.stage = None
+            self.stages[event["stage"]] = event["duration"]
+
+    def render(self):
+        lines = ["🔄 Parsing progress"]
+        if self.days:
+            lines.append(f"📅 Days: {self.days_done}/{self.days}, matches found: {self.matches}")
+        lines.append(f"🏒 Match pages parsed: {self.parsed}, cache hits: {self.cache_hits}")
+        for stage, duration in self.stages.items():
+            lines.append(f"✓ {STAGE_NAMES.get(stage, stage)}: {round(duration, 1)} s")
+        if self.stage:
+            lines.append(f"⏳ {STAGE_NAMES.get(self.stage, self.stage)}...")
+        return "\n".join(lines)
+
+    async def __call__(self, event):
+        self.update(event)
+        urgent = event["event"] in (STAGE_STARTED, STAGE_FINISHED)
+        if not urgent and time.time() - self.last_sent < self.interval:
+            return
+        text = self.render()
+        if text == self.last_text:
+            return
+        self.last_sent = time.time()
+        self.last_text = text
+        try:
+            if self.message_id is None:
+                message = await self.bot.send_message(chat_id=self.chat_id, text=text)
+                self.message_id = message.message_id
+            else:
+                await self.bot.edit_message_text(
+                    text=text, chat_id=self.chat_id, message_id=self.message_id
+                )
+        except TelegramError as e:
+            print(f"Failed to update progress for chat {self.chat_id}: {e}")
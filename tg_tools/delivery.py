@@ -0,0 +1,127 @@
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import time
+from contextlib import closing
+
+DELIVERIES_DB_PATH = "./deliveries.db"
+# Сколько URL проверять одним запросом (предел параметров SQLite - 999 в старых сборках)
+URL_BATCH = 500
+
+# Форматы выдачи: исходные файлы, сжатые файлы и только новые для чата матчи
+MODES = ("json", "db", "both", "gzip", "delta")
+
+
+class DeliveryLog:
+    """
+    Журнал отправленных матчей: какие URL матчей уже получил каждый чат.
+    По нему строится выгрузка "новое с прошлого запроса", размер которой
+    зависит от числа новых матчей, а не от всей истории.
+    """
+
+    def __init__(self, path=DELIVERIES_DB_PATH):
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS deliveries (
+                       chat_id INTEGER NOT NULL,
+                       url TEXT NOT NULL,
+                       delivered_at REAL NOT NULL,
+                       PRIMARY KEY (chat_id, url)
+                   ) WITHOUT ROWID"""
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def undelivered(self, chat_id, urls):
+        """Возвращает те из urls, которые еще не отправлялись в чат"""
+        urls = list(urls)
+        delivered = set()
+        with closing(self._connect()) as conn:
+            for i in range(0, len(urls), URL_BATCH):
+                batch = urls[i : i + URL_BATCH]
+                placeholders = ", ".join("?" * len(batch))
+                delivered.update(
+                    row[0]
+                    for row in conn.execute(
+                        f"SELECT url FROM deliveries WHERE chat_id = ? AND url IN ({placeholders})",
+                        (chat_id, *batch),
+                    )
+                )
+        return [url for url in urls if url not in delivered]
+
+    def mark_delivered(self, chat_id, urls):
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO deliveries(chat_id, url, delivered_at) VALUES (?, ?, ?)",
+                ((chat_id, url, now) for url in urls),
+            )
+
+
+def write_json_gz(data, path):
+    """Компактный JSON (без отступов), сжатый gzip"""
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def gzip_file(src, dst):
+    with open(src, "rb") as f_in, gzip.open(dst, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+
+
+def prepare_delivery(chat_id, mode, paths, log):
+    """
+    Готовит файлы для отправки в чат по результатам задачи paths.
+    Возвращает (files, urls): files - список (путь, имя файла, подпись),
+    urls - URL матчей, которые чат получит; после успешной отправки
+    их нужно передать в log.mark_delivered.
+    Сжатые файлы пишутся рядом с результатами, с chat_id в имени, потому что
+    каталог задачи может быть общим для нескольких чатов.
+    """
+    with open(paths["json"], "r", encoding="utf-8") as f:
+        data = json.load(f)
+    matches = data.get("matches", [])
+    urls = [match["url"] for match in matches]
+    job_dir = os.path.dirname(paths["json"])
+
+    if mode == "json":
+        files = [(paths["json"], os.path.basename(paths["json"]), "Parsed matches data (JSON)")]
+    elif mode == "db":
+        files = [(paths["db"], os.path.basename(paths["db"]), "Database with statistics")]
+    elif mode == "both":
+        files = [
+            (paths["json"], os.path.basename(paths["json"]), "Parsed matches data (JSON)"),
+            (paths["db"], os.path.basename(paths["db"]), "Database with statistics"),
+        ]
+    elif mode == "gzip":
+        json_gz = os.path.join(job_dir, f"{chat_id}_{os.path.basename(paths['json'])}.gz")
+        db_gz = os.path.join(job_dir, f"{chat_id}_{os.path.basename(paths['db'])}.gz")
+        write_json_gz(data, json_gz)
+        gzip_file(paths["db"], db_gz)
+        files = [
+            (json_gz, os.path.basename(paths["json"]) + ".gz", "Parsed matches data (compact JSON, gzip)"),
+            (db_gz, os.path.basename(paths["db"]) + ".gz", "Database with statistics (gzip)"),
+        ]
+    elif mode == "delta":
+        new_urls = set(log.undelivered(chat_id, urls))
+        new_matches = [match for match in matches if match["url"] in new_urls]
+        urls = [match["url"] for match in new_matches]
+        if not new_matches:
+            return [], []
+        delta = {
+            "matches": new_matches,
+            "source_urls": sorted({m["source_url"] for m in new_matches if m.get("source_url")}),
+            "matches_found": len(new_matches),
+        }
+        delta_gz = os.path.join(job_dir, f"{chat_id}_matches_delta.json.gz")
+        write_json_gz(delta, delta_gz)
+        files = [
+            (delta_gz, "matches_delta.json.gz", f"New matches since your last request: {len(new_matches)}"),
+        ]
+    else:
+        raise ValueError(f"Unknown output mode: {mode}")
+    return files, urls
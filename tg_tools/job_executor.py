@@ -0,0 +1,138 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+MAX_WORKERS = 2
+MAX_QUEUE = 10
+
+
+class QueueFullError(Exception):
+    """Очередь задач заполнена, новую задачу принять нельзя"""
+
+
+class JobExecutor:
+    """
+    Выполняет тяжелые синхронные задачи (парсинг) в пуле процессов,
+    чтобы они не блокировали event loop бота.
+    Одновременно выполняется не больше max_workers задач, в очереди
+    ждет не больше max_queue; для каждого чата хранится статус его задачи.
+    Задачи с одинаковым ключом, запрошенные пока первая еще не завершилась,
+    не запускаются повторно: все запросившие чаты ждут один и тот же результат.
+    События хода задачи (см. tools/progress.py) передаются из процесса через
+    очередь Manager и раздаются обработчикам on_progress всех ее чатов.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, max_queue=MAX_QUEUE):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ProcessPoolExecutor(max_workers=max_workers)
+        self._slots = asyncio.Semaphore(max_workers)
+        self._inflight = {}
+        self._chat_jobs = {}
+        self._manager = None
+
+    def _event_queue(self):
+        # Обычную multiprocessing.Queue нельзя передать аргументом в пул процессов,
+        # прокси очереди Manager - можно
+        if self._manager is None:
+            self._manager = multiprocessing.Manager()
+        return self._manager.Queue()
+
+    @staticmethod
+    async def _relay(job, events):
+        loop = asyncio.get_running_loop()
+        while True:
+            event = await loop.run_in_executor(None, events.get)
+            if event is None:
+                return
+            job["progress"] = event
+            for listener in list(job["listeners"]):
+                try:
+                    await listener(event)
+                except Exception as e:
+                    print(f"Progress listener error: {e}")
+
+    @staticmethod
+    def _set_status(job, status, error=None):
+        job["status"] = status
+        job["error"] = error
+        job["updated"] = time.time()
+
+    async def _execute(self, job, fn, args, events):
+        relay = None
+        try:
+            async with self._slots:
+                self._set_status(job, "running")
+                if events is not None:
+                    relay = asyncio.ensure_future(self._relay(job, events))
+                    fn = partial(fn, events=events)
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._pool, fn, *args)
+        except Exception as e:
+            self._set_status(job, "failed", error=str(e))
+            raise
+        finally:
+            if relay is not None:
+                # Дожидаемся, пока все события задачи дойдут до чатов
+                events.put(None)
+                await relay
+            self._inflight.pop(job["key"], None)
+
+        self._set_status(job, "done")
+        return result
+
+    async def run(self, chat_id, fn, *args, key=None, description="", on_progress=None):
+        """
+        Ставит fn(*args) в очередь и ждет результата.
+        fn и аргументы должны быть picklable (функция верхнего уровня модуля).
+        Если задача с таким же key уже выполняется, чат присоединяется к ней.
+        on_progress - корутина, которая получает события хода задачи;
+        для нее fn вызывается с аргументом events (очередь событий).
+        """
+        job = self._inflight.get(key) if key is not None else None
+        if job is None:
+            if len(self._inflight) >= self.max_queue:
+                raise QueueFullError(f"В очереди уже {len(self._inflight)} задач")
+
+            job = {
+                "key": key if key is not None else object(),
+                "description": description,
+                "chats": set(),
+                "listeners": [],
+                "progress": None,
+            }
+            self._set_status(job, "queued")
+            events = self._event_queue() if on_progress is not None else None
+            job["future"] = asyncio.ensure_future(self._execute(job, fn, args, events))
+            self._inflight[job["key"]] = job
+
+        job["chats"].add(chat_id)
+        if on_progress is not None:
+            job["listeners"].append(on_progress)
+        self._chat_jobs[chat_id] = job
+        # shield: отмена ожидания одним чатом не отменяет общую задачу
+        return await asyncio.shield(job["future"])
+
+    @property
+    def pending(self):
+        return len(self._inflight)
+
+    def status(self, chat_id):
+        job = self._chat_jobs.get(chat_id)
+        if job is None:
+            return None
+        return {
+            "status": job["status"],
+            "description": job["description"],
+            "error": job["error"],
+            "updated": job["updated"],
+            "shared_with": len(job["chats"]) - 1,
+            "progress": job["progress"],
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
@@ -1,63 +1,81 @@
 import json
-import random
 import sqlite3
 import os
+import time
 
 # Путь к JSON и БД (указать нужные пути из проекта)
 JSON_PATH = "matches_data.json"
 DB_PATH = "hockey_matches.db"
 
-# Возможные амплуа игроков в хоккее
 
-
-def update_db_schema_and_insert_positions():
-    if not os.path.exists(DB_PATH):
-        print(f"База данных не найдена по пути {DB_PATH}")
+def update_db_schema_and_insert_positions(json_path=JSON_PATH, db_path=DB_PATH):
+    """
+    Дописывает амплуа игроков в match_lineups для баз, собранных без них.
+    create_hockey_database уже пишет position вместе с составами, так что
+    нужна эта функция только для старых файлов. Все позиции обновляются
+    одним UPDATE ... FROM по временной таблице, а не запросом на игрока.
+    """
+    if not os.path.exists(db_path):
+        print(f"База данных не найдена по пути {db_path}")
         return
 
-    conn = sqlite3.connect(DB_PATH)
+    start = time.time()
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
-    try:
+    cursor.execute("PRAGMA table_info(match_lineups)")
+    if not any(row[1] == "position" for row in cursor.fetchall()):
         # Добавляем колонку position в таблицу match_lineups
         cursor.execute("ALTER TABLE match_lineups ADD COLUMN position TEXT")
         print("Столбец 'position' добавлен в таблицу match_lineups")
-    except sqlite3.OperationalError:
-        print("Столбец 'position' уже существует или возникла ошибка")
 
-    with open(JSON_PATH, "r", encoding="utf-8") as f:
+    # В новых базах матч ищется по URL, в старых - по тексту матча
+    cursor.execute("PRAGMA table_info(matches)")
+    match_key = (
+        "url" if any(row[1] == "url" for row in cursor.fetchall()) else "match_text"
+    )
+
+    with open(json_path, "r", encoding="utf-8") as f:
         data = json.load(f)
 
+    rows = []
     for match in data.get("matches", []):
+        match_value = match.get("url") if match_key == "url" else match.get("text", "")
         for team_key, team_name_key in [
             ("lineup_team1", "team1"),
             ("lineup_team2", "team2"),
         ]:
-            players = match.get("stats", {}).get(team_key, [])
             team_name = match.get(team_name_key, "")
-
-            # Для каждого игрока обновляем поле position в match_lineups
-            for player_info in players:
-                player_name = player_info["name"]
-                position = player_info["position"]
-
-                # Обновляем position для игрока по match, команде и игроку
-                # Для поиска player_id и team_id сделаем вложенный запрос
-                cursor.execute(
-                    """
-                    UPDATE match_lineups
-                    SET position = ?
-                    WHERE match_id = (
-                        SELECT id FROM matches WHERE match_text = ?
-                    ) AND team_id = (
-                        SELECT id FROM teams WHERE name = ?
-                    ) AND player_id = (
-                        SELECT id FROM players WHERE name = ?
-                    )
-                """,
-                    (position, match.get("text", ""), team_name, player_name),
+            for player_info in match.get("stats", {}).get(team_key, []):
+                rows.append(
+                    (match_value, team_name, player_info["name"], player_info["position"])
                 )
 
+    cursor.execute("""
+    CREATE TEMP TABLE new_positions (
+        match_key TEXT,
+        team_name TEXT,
+        player_name TEXT,
+        position TEXT
+    )
+    """)
+    cursor.executemany("INSERT INTO new_positions VALUES (?, ?, ?, ?)", rows)
+
+    cursor.execute(f"""
+    UPDATE match_lineups
+    SET position = p.position
+    FROM new_positions AS p
+    JOIN matches AS m ON m.{match_key} = p.match_key
+    JOIN teams AS t ON t.name = p.team_name
+    JOIN players AS pl ON pl.name = p.player_name
+    WHERE match_lineups.match_id = m.id
+      AND match_lineups.team_id = t.id
+      AND match_lineups.player_id = pl.id
+    """)
+
     conn.commit()
     conn.close()
-    print("База данных обновлена: позиции игроков добавлены.")
+    print(
+        f"База данных обновлена: позиции игроков добавлены "
+        f"за {round(time.time() - start, 3)} секунд."
+    )
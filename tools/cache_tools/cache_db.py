@@ -0,0 +1,209 @@
+import glob
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from tools.cache_tools.memory_cache import MemoryCache
+
+CACHE_DIR = "./cache"
+CACHE_DB_PATH = os.path.join(CACHE_DIR, "cache.db")
+CACHE_SCHEMA_VERSION = 1
+# Предел размера сжатых значений, сверх него вытесняются давно не читанные записи
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+EVICT_BATCH = 100
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS entries (
+        namespace TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL,
+        accessed_at REAL NOT NULL,
+        PRIMARY KEY (namespace, key)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)",
+    "CREATE INDEX IF NOT EXISTS idx_entries_expires ON entries(expires_at)",
+    # Общий размер поддерживается триггерами, чтобы не считать SUM на каждой записи
+    "CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 1), size INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO totals(id, size) VALUES (1, 0)",
+    """
+    CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries
+    BEGIN UPDATE totals SET size = size + NEW.size WHERE id = 1; END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries
+    BEGIN UPDATE totals SET size = size - OLD.size WHERE id = 1; END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries
+    BEGIN UPDATE totals SET size = size - OLD.size + NEW.size WHERE id = 1; END
+    """,
+]
+
+
+# Соединения, унаследованные через fork, см. _connect
+_inherited_connections = []
+
+
+class CacheDB:
+    """
+    Кэш в одном файле SQLite: значения хранятся сжатым JSON,
+    у каждой записи свой TTL, при превышении max_bytes вытесняются
+    давно не читанные записи (LRU). Каждая запись - отдельная транзакция,
+    поэтому оборванный процесс не оставляет полузаписанных значений.
+    Поиск идет по первичному ключу (namespace, key).
+    Перед диском стоит MemoryCache: повторные чтения в том же процессе
+    обслуживаются из памяти без запроса к SQLite и распаковки.
+    """
+
+    def __init__(self, path=CACHE_DB_PATH, max_bytes=MAX_CACHE_BYTES, memory=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.memory = memory if memory is not None else MemoryCache()
+        self._local = threading.local()
+        self._init_schema()
+        self._remove_pickle_files()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid != os.getpid():
+            # Соединение досталось от родителя через fork (пул процессов бота):
+            # SQLite запрещает им пользоваться, а закрытие может тронуть WAL
+            # родителя, поэтому оно просто остается неиспользованным
+            _inherited_connections.append(conn)
+            conn = None
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != CACHE_SCHEMA_VERSION:
+            # Кэш можно выбросить: при смене формата просто начинаем заново
+            conn.execute("DROP TABLE IF EXISTS entries")
+            conn.execute("DROP TABLE IF EXISTS totals")
+        for statement in SCHEMA:
+            conn.execute(statement)
+        conn.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+
+    def _remove_pickle_files(self):
+        """
+        Удаляет файлы старого кэша (<md5 URL>.pkl) рядом с базой.
+        Перенести их нельзя: по имени файла не восстановить URL,
+        а списки матчей в них отобраны по неизвестной лиге.
+        """
+        removed = 0
+        for path in glob.glob(os.path.join(os.path.dirname(self.path) or ".", "*.pkl")):
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        if removed:
+            print(f"Удалены файлы старого кэша: {removed}")
+
+    def get(self, namespace, key):
+        """Возвращает значение или None, если записи нет или она устарела"""
+        value = self.memory.get((namespace, key))
+        if value is not None:
+            return value
+
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        now = time.time()
+        if expires_at is not None and expires_at <= now:
+            conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+            return None
+        conn.execute(
+            "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+            (now, namespace, key),
+        )
+        data = json.loads(zlib.decompress(value))
+        self.memory.set((namespace, key), data, expires_at)
+        return data
+
+    def set(self, namespace, key, data, ttl=None):
+        """Сохраняет значение; ttl в секундах, None - хранить бессрочно"""
+        value = zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+            conn.execute(
+                """INSERT INTO entries(namespace, key, value, size, created_at, expires_at, accessed_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (namespace, key, value, len(value), now, expires_at, now),
+            )
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self.memory.set((namespace, key), data, expires_at)
+
+    def _evict(self, conn):
+        while conn.execute("SELECT size FROM totals WHERE id = 1").fetchone()[0] > self.max_bytes:
+            deleted = conn.execute(
+                """DELETE FROM entries WHERE (namespace, key) IN (
+                       SELECT namespace, key FROM entries ORDER BY accessed_at LIMIT ?
+                   )""",
+                (EVICT_BATCH,),
+            ).rowcount
+            if not deleted:
+                break
+
+    def delete(self, namespace, key):
+        self.memory.delete((namespace, key))
+        self._connect().execute(
+            "DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+        )
+
+    def purge_expired(self):
+        """Удаляет устаревшие записи, возвращает их количество"""
+        return self._connect().execute(
+            "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (time.time(),),
+        ).rowcount
+
+    def clear(self):
+        self.memory.clear()
+        self._connect().execute("DELETE FROM entries")
+
+
+_cache_db = None
+_cache_db_lock = threading.Lock()
+
+
+def get_cache_db():
+    """Возвращает общий для процесса CacheDB"""
+    global _cache_db
+    with _cache_db_lock:
+        if _cache_db is None:
+            _cache_db = CacheDB()
+        return _cache_db
@@ -0,0 +1,48 @@
+from datetime import date, datetime
+
+# Матч со статусом "окончен" больше не меняется и кэшируется бессрочно
+FINISHED_MARK = "окончен"
+# Сколько дней назад страница дня еще может обновляться (поздние матчи, протоколы)
+RECENT_DAYS = 2
+RECENT_TTL = 15 * 60
+# Незавершенные матчи (идут, перенесены) перепроверяем чаще
+UNFINISHED_TTL = 5 * 60
+# Старый день с незавершенными матчами (перенос) - перепроверяем раз в сутки
+STALE_TTL = 24 * 60 * 60
+
+
+def is_finished(match_info):
+    return FINISHED_MARK in match_info.get("text", "").lower()
+
+
+def day_from_url(url):
+    """https://www.championat.com/stat/hockey/#2025-11-11 -> date(2025, 11, 11)"""
+    try:
+        return datetime.strptime(url.rsplit("#", 1)[1], "%Y-%m-%d").date()
+    except (IndexError, ValueError):
+        return None
+
+
+def match_ttl(match_info):
+    """TTL для статистики матча: None (бессрочно) для оконченных матчей"""
+    return None if is_finished(match_info) else UNFINISHED_TTL
+
+
+def day_ttl(url, matches, failed=0, today=None):
+    """
+    TTL для страницы дня: None (бессрочно), если день в прошлом
+    и все его матчи окончены, иначе короткий срок.
+    failed - сколько матчей дня не удалось разобрать: их нет в matches,
+    поэтому такой день кэшируется ненадолго, чтобы они были загружены повторно.
+    """
+    if failed:
+        return UNFINISHED_TTL
+    day = day_from_url(url)
+    if day is None:
+        return RECENT_TTL
+    days_ago = ((today or date.today()) - day).days
+    if days_ago < RECENT_DAYS:
+        return RECENT_TTL
+    if all(is_finished(match) for match in matches):
+        return None
+    return STALE_TTL
@@ -1,14 +1,19 @@
-from tools.cache_tools.get_cache_file import get_cache_file
-import hashlib
-import os
-import pickle
-CACHE_DIR = "./cache"
+from tools.cache_tools.cache_db import get_cache_db
 
-def load_from_cache(url):
+DAY_NAMESPACE = "day"
+
+
+def day_key(url, league):
+    """
+    Ключ страницы дня в кэше. В кэше лежит список матчей, уже отобранных
+    по лиге, поэтому лига входит в ключ.
+    """
+    return f"{league}|{url}"
+
+
+def load_from_cache(url, league="all"):
     """Загружает данные из кэша"""
-    cache_file = get_cache_file(url)
-    if os.path.exists(cache_file):
+    data = get_cache_db().get(DAY_NAMESPACE, day_key(url, league))
+    if data is not None:
         print("Используем кэшированные данные")
-        with open(cache_file, 'rb') as f:
-            return pickle.load(f)
-    return None
\ No newline at end of file
+    return data
@@ -0,0 +1,16 @@
+from tools.cache_tools.cache_db import get_cache_db
+
+# Второй уровень кэша: разобранная статистика отдельных матчей по URL матча.
+# Он не зависит от страницы дня и фильтра лиги, поэтому матч, уже
+# разобранный в любом прошлом запуске, повторно не загружается.
+MATCH_NAMESPACE = "match"
+
+
+def load_match_from_cache(match_url):
+    """Загружает статистику матча из кэша или возвращает None"""
+    return get_cache_db().get(MATCH_NAMESPACE, match_url)
+
+
+def save_match_to_cache(match_url, stats, ttl=None):
+    """Сохраняет статистику матча в кэш; ttl в секундах, None - бессрочно"""
+    get_cache_db().set(MATCH_NAMESPACE, match_url, stats, ttl=ttl)
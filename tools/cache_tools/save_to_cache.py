@@ -1,12 +1,7 @@
-import hashlib
-import os
-import pickle
-CACHE_DIR = "./cache"
-from tools.cache_tools.get_cache_file import get_cache_file
-def save_to_cache(url, data):
-    """Сохраняет данные в кэш"""
-    if not os.path.exists(CACHE_DIR):
-        os.makedirs(CACHE_DIR)
-    cache_file = get_cache_file(url)
-    with open(cache_file, 'wb') as f:
-        pickle.dump(data, f)
\ No newline at end of file
+from tools.cache_tools.cache_db import get_cache_db
+from tools.cache_tools.load_from_cache import DAY_NAMESPACE, day_key
+
+
+def save_to_cache(url, data, league="all", ttl=None):
+    """Сохраняет данные в кэш; ttl в секундах, None - бессрочно"""
+    get_cache_db().set(DAY_NAMESPACE, day_key(url, league), data, ttl=ttl)
@@ -2,10 +2,12 @@ import sqlite3
 import json
 import os
 import re
+import time
 from datetime import datetime
 from tools.database_tools.extract_time_from_match_text import (
     extract_time_from_match_text,
 )
+from tools.database_tools.schema import ensure_schema, drop_indexes, create_indexes
 
 JSON_PATH = "matches_data.json"
 DB_PATH = "hockey_matches.db"
@@ -23,8 +25,73 @@ def get_player_name(player):
     return None
 
 
-def create_hockey_database(jsonfilepath=JSON_PATH, dbfilepath=DB_PATH):
-    if os.path.exists(dbfilepath):
+def _to_int(value):
+    """Число из строки статистики ("7100", "95%") или None"""
+    if value is None:
+        return None
+    digits = re.sub(r"\D", "", str(value))
+    return int(digits) if digits else None
+
+
+def _match_date(source_url):
+    """Дата матча из URL страницы дня (.../stat/hockey/#2025-11-11)"""
+    match = re.search(r"#(\d{4}-\d{2}-\d{2})$", source_url or "")
+    return match.group(1) if match else None
+
+
+class _NameIds:
+    """
+    Словарь имя -> id для таблицы справочника (команды, игроки, стадионы).
+    Существующие записи читаются из базы один раз, новым сразу выдается
+    следующий id, а сами строки копятся для одного executemany.
+    """
+
+    def __init__(self, cursor, table):
+        cursor.execute(f"SELECT name, id FROM {table}")
+        self.ids = {}
+        for name, row_id in cursor.fetchall():
+            # При дубликатах имен в старых базах берем первый id, как раньше
+            self.ids.setdefault(name, row_id)
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+        self.next_id = cursor.fetchone()[0] + 1
+        self.new_rows = []
+
+    def get(self, name, *extra):
+        row_id = self.ids.get(name)
+        if row_id is None:
+            row_id = self.next_id
+            self.next_id += 1
+            self.ids[name] = row_id
+            self.new_rows.append((row_id, name, *extra))
+        return row_id
+
+
+def _tune_for_bulk_load(cursor, fresh):
+    """
+    PRAGMA на время загрузки: большой кэш страниц и временные данные в памяти.
+    Без fsync и с журналом в памяти грузим только новую базу - ее не жалко
+    потерять при сбое. При дозаписи в накопленную базу fsync сокращаем
+    до NORMAL, чтобы сбой питания не испортил историю.
+    """
+    cursor.execute("PRAGMA cache_size = -65536")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    if fresh:
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.execute("PRAGMA journal_mode = MEMORY")
+    else:
+        cursor.execute("PRAGMA synchronous = NORMAL")
+
+
+def create_hockey_database(jsonfilepath=JSON_PATH, dbfilepath=DB_PATH, incremental=False):
+    """
+    Строит базу из JSON с матчами.
+    incremental=False - база пересоздается с нуля.
+    incremental=True - существующая база дополняется только матчами,
+    URL которых в ней еще нет; id команд, игроков и стадионов сохраняются.
+    Матчи из старых баз без URL сопоставляются по тексту и времени матча:
+    совпавшей записи проставляется URL, новая не добавляется.
+    """
+    if not incremental and os.path.exists(dbfilepath):
         os.remove(dbfilepath)
         print(f"Removed existing database: {dbfilepath}")
 
@@ -36,120 +103,143 @@ def create_hockey_database(jsonfilepath=JSON_PATH, dbfilepath=DB_PATH):
 
     cursor.execute("PRAGMA foreign_keys = ON")
 
-    cursor.execute("""
-    CREATE TABLE teams (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL UNIQUE
-    )
-    """)
+    # Создаем таблицы или мигрируем старую базу до текущей версии схемы
+    ensure_schema(conn)
 
-    cursor.execute("""
-    CREATE TABLE players (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL
-    )
-    """)
-
-    cursor.execute("""
-    CREATE TABLE matches (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        match_text TEXT,
-        match_time TEXT,
-        team1_id INTEGER NOT NULL,
-        team2_id INTEGER NOT NULL,
-        score TEXT,
-        stadium_id INTEGER,
-        viewers INTEGER,
-        attendance_percent INTEGER
-    )
-    """)
-
-    cursor.execute("""
-    CREATE TABLE match_lineups (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        match_id INTEGER NOT NULL,
-        team_id INTEGER NOT NULL,
-        player_id INTEGER NOT NULL,
-        position TEXT
-    )
-    """)
-
-    cursor.execute("""
-    CREATE TABLE stadiums (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL,
-        city TEXT NOT NULL,
-        max_capacity INTEGER
-    )
-    """)
-
-    for match in data.get("matches", []):
-        team1 = match.get("team1", "").strip()
-        team2 = match.get("team2", "").strip()
+    _tune_for_bulk_load(cursor, fresh=not incremental)
+    if not incremental:
+        # В пустую базу быстрее залить данные, а индексы построить один раз в конце
+        drop_indexes(cursor)
 
-        cursor.execute("INSERT OR IGNORE INTO teams(name) VALUES (?)", (team1,))
-        cursor.execute("INSERT OR IGNORE INTO teams(name) VALUES (?)", (team2,))
+    teams = _NameIds(cursor, "teams")
+    players = _NameIds(cursor, "players")
+    stadiums = _NameIds(cursor, "stadiums")
 
-        cursor.execute("SELECT id FROM teams WHERE name=?", (team1,))
-        team1_id = cursor.fetchone()[0]
-        cursor.execute("SELECT id FROM teams WHERE name=?", (team2,))
-        team2_id = cursor.fetchone()[0]
+    known_urls = set()
+    # (текст, время) -> id матчей без URL, оставшихся от баз до появления колонки url
+    unlinked = {}
+    if incremental:
+        cursor.execute("SELECT url FROM matches WHERE url IS NOT NULL")
+        known_urls = {row[0] for row in cursor.fetchall()}
+        cursor.execute(
+            "SELECT match_text, match_time, id FROM matches WHERE url IS NULL ORDER BY id"
+        )
+        for match_text, match_time, row_id in cursor.fetchall():
+            unlinked.setdefault((match_text, match_time), []).append(row_id)
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM matches")
+    match_id = cursor.fetchone()[0]
+
+    match_rows = []
+    linked_rows = []
+    lineup_rows = []
+    for match in data.get("matches", []):
+        url = match.get("url")
+        if url:
+            if url in known_urls:
+                continue
+            known_urls.add(url)
 
         match_text = match.get("text", "").strip()
         match_time = extract_time_from_match_text(match_text)
 
+        same_match = unlinked.get((match_text, match_time))
+        if url and same_match:
+            # Матч уже есть в базе без URL: дописываем URL вместо дубликата
+            match_date = _match_date(match.get("source_url"))
+            linked_rows.append((url, match_date, same_match.pop(0)))
+            continue
+
+        team1 = match.get("team1", "").strip()
+        team2 = match.get("team2", "").strip()
+
+        team1_id = teams.get(team1)
+        team2_id = teams.get(team2)
+
         score = match.get("score", "").strip()
 
         stadion = match.get("stats", {}).get("stadion", "").strip()
         city = match.get("stats", {}).get("city", "").strip()
         max_capacity = match.get("stats", {}).get("max_capacity", None)
 
-        if stadion:
-            cursor.execute(
-                "INSERT OR IGNORE INTO stadiums(name, city, max_capacity) VALUES (?, ?, ?)",
-                (stadion, city, max_capacity),
+        stadium_id = stadiums.get(stadion, city, max_capacity) if stadion else None
+        viewers = _to_int(match.get("stats", {}).get("viewers"))
+        attendance_percent = _to_int(match.get("stats", {}).get("attendance_percent"))
+        match_date = _match_date(match.get("source_url"))
+
+        match_id += 1
+        match_rows.append(
+            (
+                match_id,
+                url,
+                match_date,
+                match_text,
+                match_time,
+                team1_id,
+                team2_id,
+                score,
+                stadium_id,
+                viewers,
+                attendance_percent,
             )
-            cursor.execute("SELECT id FROM stadiums WHERE name=?", (stadion,))
-            stadium_id = cursor.fetchone()[0]
-        else:
-            stadium_id = None
-
-        cursor.execute(
-            """INSERT INTO matches(match_text, match_time, team1_id, team2_id, score, stadium_id)
-                          VALUES (?, ?, ?, ?, ?, ?)""",
-            (match_text, match_time, team1_id, team2_id, score, stadium_id),
         )
-        match_id = cursor.lastrowid
 
         for team_key, team_id in [
             ("lineup_team1", team1_id),
             ("lineup_team2", team2_id),
         ]:
-            players = match.get("stats", {}).get(team_key, [])
-            for player in players:
+            for player in match.get("stats", {}).get(team_key, []):
                 name = get_player_name(player)
                 if not name:
                     continue
 
-                cursor.execute(
-                    "INSERT OR IGNORE INTO players(name) VALUES (?)", (name,)
-                )
-                cursor.execute("SELECT id FROM players WHERE name=?", (name,))
-                player_id = cursor.fetchone()[0]
-
                 position = (
                     player["position"]
                     if (isinstance(player, dict) and "position" in player)
                     else None
                 )
+                lineup_rows.append((match_id, team_id, players.get(name), position))
 
-                cursor.execute(
-                    """INSERT INTO match_lineups(match_id, team_id, player_id, position)
-                                  VALUES (?, ?, ?, ?)""",
-                    (match_id, team_id, player_id, position),
-                )
+    # Все вставки одной транзакцией, пачками через executemany
+    cursor.executemany("INSERT INTO teams(id, name) VALUES (?, ?)", teams.new_rows)
+    cursor.executemany(
+        "INSERT INTO players(id, name) VALUES (?, ?)", players.new_rows
+    )
+    cursor.executemany(
+        "INSERT INTO stadiums(id, name, city, max_capacity) VALUES (?, ?, ?, ?)",
+        stadiums.new_rows,
+    )
+    cursor.executemany(
+        """INSERT INTO matches(id, url, match_date, match_text, match_time, team1_id, team2_id,
+                                 score, stadium_id, viewers, attendance_percent)
+                      VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        match_rows,
+    )
+    cursor.executemany(
+        "UPDATE matches SET url = ?, match_date = COALESCE(match_date, ?) WHERE id = ?",
+        linked_rows,
+    )
+    # Амплуа пишутся вместе с составами, отдельный проход по базе не нужен
+    lineups_start = time.time()
+    cursor.executemany(
+        """INSERT INTO match_lineups(match_id, team_id, player_id, position)
+                      VALUES (?, ?, ?, ?)""",
+        lineup_rows,
+    )
+    print(
+        f"Составы и позиции ({len(lineup_rows)} строк) записаны "
+        f"за {round(time.time() - lineups_start, 3)} секунд"
+    )
+    added_count = len(match_rows)
+    if not incremental:
+        create_indexes(cursor)
 
     conn.commit()
     conn.close()
-    print("База данных успешно создана и заполнена.")
-
+    if incremental:
+        print(
+            f"База данных дополнена: новых матчей {added_count}, "
+            f"старым матчам проставлен url: {len(linked_rows)}."
+        )
+    else:
+        print("База данных успешно создана и заполнена.")
+    return added_count
@@ -0,0 +1,229 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from tools.cache_tools.memory_cache import MemoryCache
+from tools.database_tools.generate_db import DB_PATH
+from tools.database_tools.schema import SCHEMA_VERSION
+
+QUERY_CACHE_ENTRIES = 512
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 30
+# Сколько вариантов показать, если имя подходит к нескольким записям
+MAX_CANDIDATES = 5
+
+# Запросы - постоянные строки с параметрами: sqlite3 компилирует каждую
+# один раз на соединение и дальше берет готовый statement из своего кэша
+MATCH_SELECT = """
+    SELECT m.match_date, m.match_time, t1.name AS team1, t2.name AS team2,
+           m.score, s.name AS stadium, m.viewers, m.url
+    FROM matches AS m
+    JOIN teams AS t1 ON t1.id = m.team1_id
+    JOIN teams AS t2 ON t2.id = m.team2_id
+    LEFT JOIN stadiums AS s ON s.id = m.stadium_id
+"""
+ORDER_RECENT = " ORDER BY m.match_date DESC, m.id DESC LIMIT ?"
+
+FIND_EXACT = {
+    table: f"SELECT id, name FROM {table} WHERE name = ?"
+    for table in ("teams", "players", "stadiums")
+}
+FIND_SIMILAR = {
+    table: f"""SELECT id, name FROM {table}
+               WHERE instr(casefold(name), casefold(?)) > 0
+               ORDER BY name LIMIT {MAX_CANDIDATES + 1}"""
+    for table in ("teams", "players", "stadiums")
+}
+
+TEAM_MATCHES = (
+    MATCH_SELECT
+    + " WHERE m.id IN (SELECT id FROM matches WHERE team1_id = ?"
+    + " UNION SELECT id FROM matches WHERE team2_id = ?)"
+    + ORDER_RECENT
+)
+PLAYER_TOTALS = """
+    SELECT COUNT(DISTINCT match_id) AS matches, GROUP_CONCAT(DISTINCT position) AS positions
+    FROM match_lineups WHERE player_id = ?
+"""
+PLAYER_MATCHES = (
+    MATCH_SELECT.replace("SELECT", "SELECT DISTINCT tp.name AS player_team,", 1)
+    + " JOIN match_lineups AS l ON l.match_id = m.id"
+    + " JOIN teams AS tp ON tp.id = l.team_id"
+    + " WHERE l.player_id = ?"
+    + ORDER_RECENT
+)
+STADIUM_TOTALS = """
+    SELECT s.name, s.city, s.max_capacity, COUNT(m.id) AS matches,
+           ROUND(AVG(m.viewers)) AS avg_viewers, MAX(m.viewers) AS max_viewers,
+           ROUND(AVG(m.attendance_percent)) AS avg_percent
+    FROM stadiums AS s LEFT JOIN matches AS m ON m.stadium_id = s.id
+    WHERE s.id = ?
+    GROUP BY s.id
+"""
+STADIUM_MATCHES = MATCH_SELECT + " WHERE m.stadium_id = ?" + ORDER_RECENT
+LAST_MATCHES = MATCH_SELECT + ORDER_RECENT
+
+
+class MatchQueries:
+    """
+    Готовые запросы к базе матчей для бота: результаты команды, матчи игрока,
+    посещаемость стадиона и последние матчи. База открывается только на
+    чтение, ответы хранятся в LRU-кэше в памяти и сбрасываются, как только
+    файл базы меняется (дозапись новых матчей или пересоздание).
+    Если базы еще нет или ее схема устарела, методы возвращают None.
+    """
+
+    def __init__(self, path=DB_PATH, cache_entries=QUERY_CACHE_ENTRIES):
+        self.path = path
+        self.cache = MemoryCache(cache_entries)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._signature = None
+        self._generation = 0
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self):
+        """Сбрасывает кэш и соединения, если файл базы изменился"""
+        signature = self._file_signature()
+        with self._lock:
+            if signature != self._signature:
+                self._signature = signature
+                self._generation += 1
+                self.cache.clear()
+        return signature is not None
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.generation == self._generation:
+            return conn
+        if conn is not None:
+            conn.close()
+
+        uri = Path(self.path).absolute().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True)
+        # Схему обновляет запись в базу (create_hockey_database) или запуск бота,
+        # здесь база только читается
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            conn.close()
+            print(f"Схема базы {self.path} версии {version}, нужна {SCHEMA_VERSION}")
+            return None
+        conn.row_factory = sqlite3.Row
+        # SQLite сравнивает без учета регистра только латиницу
+        conn.create_function("casefold", 1, str.casefold, deterministic=True)
+        self._local.conn = conn
+        self._local.generation = self._generation
+        return conn
+
+    def _cached(self, key, compute):
+        if not self._refresh():
+            return None
+        result = self.cache.get(key)
+        if result is None:
+            conn = self._connect()
+            if conn is None:
+                return None
+            result = compute(conn)
+            self.cache.set(key, result)
+        return result
+
+    @staticmethod
+    def _rows(conn, sql, params):
+        return [dict(row) for row in conn.execute(sql, params)]
+
+    @staticmethod
+    def _limit(limit):
+        return max(1, min(int(limit), MAX_LIMIT))
+
+    @staticmethod
+    def _find(conn, table, name):
+        """Точное совпадение имени, иначе до MAX_CANDIDATES похожих записей"""
+        row = conn.execute(FIND_EXACT[table], (name,)).fetchone()
+        if row is not None:
+            return [tuple(row)]
+        return [tuple(row) for row in conn.execute(FIND_SIMILAR[table], (name,))]
+
+    def _lookup(self, table, name, build):
+        """
+        Находит запись по имени и строит по ней ответ build(conn, id, name).
+        Если подходящих записей несколько или ни одной, возвращает
+        {"candidates": [...]} со списком найденных имен.
+        """
+
+        def compute(conn):
+            found = self._find(conn, table, name.strip())
+            if len(found) != 1:
+                return {"candidates": [row_name for _, row_name in found[:MAX_CANDIDATES]]}
+            row_id, row_name = found[0]
+            return build(conn, row_id, row_name)
+
+        return compute
+
+    def team_results(self, name, limit=DEFAULT_LIMIT):
+        """Последние матчи команды"""
+        limit = self._limit(limit)
+
+        def build(conn, team_id, team_name):
+            matches = self._rows(conn, TEAM_MATCHES, (team_id, team_id, limit))
+            return {"name": team_name, "matches": matches}
+
+        return self._cached(
+            ("team", name, limit), self._lookup("teams", name, build)
+        )
+
+    def player_appearances(self, name, limit=DEFAULT_LIMIT):
+        """Число матчей игрока, его амплуа и последние матчи"""
+        limit = self._limit(limit)
+
+        def build(conn, player_id, player_name):
+            totals = conn.execute(PLAYER_TOTALS, (player_id,)).fetchone()
+            matches = self._rows(conn, PLAYER_MATCHES, (player_id, limit))
+            return {
+                "name": player_name,
+                "total": totals["matches"],
+                "positions": totals["positions"].split(",") if totals["positions"] else [],
+                "matches": matches,
+            }
+
+        return self._cached(
+            ("player", name, limit), self._lookup("players", name, build)
+        )
+
+    def stadium_attendance(self, name, limit=DEFAULT_LIMIT):
+        """Средняя и максимальная посещаемость стадиона и последние матчи на нем"""
+        limit = self._limit(limit)
+
+        def build(conn, stadium_id, stadium_name):
+            result = dict(conn.execute(STADIUM_TOTALS, (stadium_id,)).fetchone())
+            result["matches_list"] = self._rows(conn, STADIUM_MATCHES, (stadium_id, limit))
+            return result
+
+        return self._cached(
+            ("stadium", name, limit), self._lookup("stadiums", name, build)
+        )
+
+    def last_matches(self, limit=DEFAULT_LIMIT):
+        """Последние limit матчей по дате"""
+        limit = self._limit(limit)
+        return self._cached(
+            ("last", limit), lambda conn: self._rows(conn, LAST_MATCHES, (limit,))
+        )
+
+
+_queries = None
+_queries_lock = threading.Lock()
+
+
+def get_match_queries():
+    """Возвращает общий для процесса MatchQueries для основной базы"""
+    global _queries
+    with _queries_lock:
+        if _queries is None:
+            _queries = MatchQueries()
+        return _queries
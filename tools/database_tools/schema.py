@@ -0,0 +1,201 @@
+import sqlite3
+
+# Версия схемы хранится в PRAGMA user_version.
+# 0 - базы без версии (исходная схема и схема с колонкой url),
+# 2 - уникальные имена, внешние ключи и индексы под частые запросы,
+# 3 - дата матча (match_date) для выборки последних матчей.
+SCHEMA_VERSION = 3
+
+TABLES = {
+    "teams": """
+    CREATE TABLE teams (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE
+    )
+    """,
+    "players": """
+    CREATE TABLE players (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE
+    )
+    """,
+    "stadiums": """
+    CREATE TABLE stadiums (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        city TEXT NOT NULL,
+        max_capacity INTEGER
+    )
+    """,
+    "matches": """
+    CREATE TABLE matches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT UNIQUE,
+        match_date TEXT,
+        match_text TEXT,
+        match_time TEXT,
+        team1_id INTEGER NOT NULL REFERENCES teams(id),
+        team2_id INTEGER NOT NULL REFERENCES teams(id),
+        score TEXT,
+        stadium_id INTEGER REFERENCES stadiums(id),
+        viewers INTEGER,
+        attendance_percent INTEGER
+    )
+    """,
+    "match_lineups": """
+    CREATE TABLE match_lineups (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        match_id INTEGER NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
+        team_id INTEGER NOT NULL REFERENCES teams(id),
+        player_id INTEGER NOT NULL REFERENCES players(id),
+        position TEXT
+    )
+    """,
+}
+
+# Индексы под типовые запросы: история игрока, результаты команды,
+# составы матча и посещаемость стадиона. Имена players/stadiums/teams
+# индексируются через UNIQUE.
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_lineups_match ON match_lineups(match_id, team_id)",
+    "CREATE INDEX IF NOT EXISTS idx_lineups_player ON match_lineups(player_id, match_id)",
+    "CREATE INDEX IF NOT EXISTS idx_matches_team1 ON matches(team1_id, id)",
+    "CREATE INDEX IF NOT EXISTS idx_matches_team2 ON matches(team2_id, id)",
+    "CREATE INDEX IF NOT EXISTS idx_matches_stadium ON matches(stadium_id, viewers)",
+    "CREATE INDEX IF NOT EXISTS idx_matches_date ON matches(match_date, id)",
+]
+
+
+def drop_indexes(cursor):
+    """Удаляет вторичные индексы, чтобы массовая загрузка их не перестраивала"""
+    for index_sql in INDEXES:
+        name = index_sql.split(" ON ")[0].split()[-1]
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def create_indexes(cursor):
+    for index_sql in INDEXES:
+        cursor.execute(index_sql)
+
+
+def _columns(cursor, table):
+    cursor.execute(f"PRAGMA table_info({table})")
+    return [row[1] for row in cursor.fetchall()]
+
+
+def _table_exists(cursor, table):
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)
+    )
+    return cursor.fetchone() is not None
+
+
+def _create_tables(cursor):
+    for create_sql in TABLES.values():
+        cursor.execute(create_sql)
+    create_indexes(cursor)
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def _migrate(cursor, version):
+    """Переводит базу версии version на текущую схему"""
+    if version < 2:
+        _rebuild_tables(cursor)
+    elif version < 3:
+        # Дату для уже загруженных матчей взять неоткуда, они остаются с NULL
+        cursor.execute("ALTER TABLE matches ADD COLUMN match_date TEXT")
+    create_indexes(cursor)
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def _rebuild_tables(cursor):
+    """
+    Переводит базу без версии на текущую схему: схлопывает дубликаты игроков
+    и стадионов по имени (ссылки переводятся на минимальный id) и
+    пересоздает таблицы с ограничениями, сохраняя все id.
+    """
+    if "url" not in _columns(cursor, "matches"):
+        cursor.execute("ALTER TABLE matches ADD COLUMN url TEXT")
+    if "position" not in _columns(cursor, "match_lineups"):
+        cursor.execute("ALTER TABLE match_lineups ADD COLUMN position TEXT")
+
+    cursor.execute("""
+    UPDATE match_lineups SET player_id = (
+        SELECT MIN(same.id) FROM players AS p
+        JOIN players AS same ON same.name = p.name
+        WHERE p.id = match_lineups.player_id
+    )
+    """)
+    cursor.execute(
+        "DELETE FROM players WHERE id NOT IN (SELECT MIN(id) FROM players GROUP BY name)"
+    )
+    cursor.execute("""
+    UPDATE matches SET stadium_id = (
+        SELECT MIN(same.id) FROM stadiums AS s
+        JOIN stadiums AS same ON same.name = s.name
+        WHERE s.id = matches.stadium_id
+    )
+    WHERE stadium_id IS NOT NULL
+    """)
+    cursor.execute(
+        "DELETE FROM stadiums WHERE id NOT IN (SELECT MIN(id) FROM stadiums GROUP BY name)"
+    )
+
+    for table in TABLES:
+        cursor.execute(f"ALTER TABLE {table} RENAME TO old_{table}")
+    for create_sql in TABLES.values():
+        cursor.execute(create_sql)
+    for table in TABLES:
+        old_columns = set(_columns(cursor, f"old_{table}"))
+        columns = ", ".join(c for c in _columns(cursor, table) if c in old_columns)
+        cursor.execute(
+            f"INSERT INTO {table}({columns}) SELECT {columns} FROM old_{table}"
+        )
+    for table in TABLES:
+        cursor.execute(f"DROP TABLE old_{table}")
+
+
+def ensure_schema(conn):
+    """
+    Создает таблицы в новой базе или мигрирует существующую
+    до SCHEMA_VERSION. Миграция выполняется одной транзакцией.
+    """
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA user_version")
+    version = cursor.fetchone()[0]
+    if version == SCHEMA_VERSION:
+        return
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Схема базы версии {version} новее поддерживаемой {SCHEMA_VERSION}"
+        )
+
+    if not _table_exists(cursor, "matches"):
+        _create_tables(cursor)
+        conn.commit()
+        return
+
+    print(f"Мигрируем схему базы с версии {version} на {SCHEMA_VERSION}")
+    conn.commit()
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None
+    cursor.execute("PRAGMA foreign_keys = OFF")
+    try:
+        cursor.execute("BEGIN")
+        _migrate(cursor, version)
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        cursor.execute("PRAGMA foreign_keys = ON")
+        conn.isolation_level = isolation_level
+
+
+def migrate_database(dbfilepath):
+    """Обновляет схему существующего файла базы до текущей версии"""
+    conn = sqlite3.connect(dbfilepath)
+    try:
+        ensure_schema(conn)
+    finally:
+        conn.close()
@@ -1,119 +1,168 @@
 import re
+from tools.is_valid_name import TEAMS
 
-def extract_teams_from_match_text(match_text):
+# Список известных команд для более точного определения
+KNOWN_TEAMS = [
+    # ... существующие команды ...
+    # Добавьте иностранные команды
+    "Айсберен Берлин", "Гренобль", "Фиштаун Пингвинз", "Лукко",
+    "Больцано", "Маунтфилд", "Лозанна", "Ингольштадт", "Берн",
+    "Комета Брно", "Цуг", "Белфаст Джайантс", "Оденсе Бульдогс",
+    "Клагенфуртер", "ГКС Тыхы", "Лулео", "Брюнес", "Цюрих Лайонс",
+    "Ильвес", "Сторхамар"
+]
+
+# Убираем знаки препинания, оставляем дефисы и тире
+PUNCTUATION_RE = re.compile(r'[^\w\s–\-]')
+SPACES_RE = re.compile(r'\s+')
+# Служебные слова: время (13:30), счет (0:2, 4:3), статус матча, овертайм, буллиты
+SKIP_RE = re.compile(r'^(?:\d{1,2}:\d{1,2}|\d+[:]\d+|окончен|ОТ|Б)$')
+DASHES = frozenset(['–', '-', '—'])
+TEAMS_WITH_DASH_RE = re.compile(r'([А-Яа-яA-Za-z\s]+)\s*[–\-]\s*([А-Яа-яA-Za-z\s]+)')
+TIME_RE = re.compile(r'^\d{1,2}:\d{1,2}$')
+SCORE_RE = re.compile(r'^\d+[:]\d+$')
+TEAM2_STOP_WORDS = frozenset(['окончен', 'ОТ', 'Б'])
+
+_END = object()
+
+
+class TeamMatcher:
     """
-    Извлекает названия команд из текста матча
-    Возвращает список: ['team1', 'team2']
+    Префиксное дерево по словам названий команд (в нижнем регистре).
+    Строится один раз и за один проход слева направо находит
+    самое длинное известное название, начинающееся с данного слова.
     """
-    
-    # Список известных команд для более точного определения
-    KNOWN_TEAMS = [
-        # ... существующие команды ...
-        # Добавьте иностранные команды
-        "Айсберен Берлин", "Гренобль", "Фиштаун Пингвинз", "Лукко", 
-        "Больцано", "Маунтфилд", "Лозанна", "Ингольштадт", "Берн", 
-        "Комета Брно", "Цуг", "Белфаст Джайантс", "Оденсе Бульдогс",
-        "Клагенфуртер", "ГКС Тыхы", "Лулео", "Брюнес", "Цюрих Лайонс",
-        "Ильвес", "Сторхамар"
-    ]
-    
-    # Очищаем текст от лишних символов и приводим к нижнему регистру для сравнения
-    clean_text = re.sub(r'[^\w\s–\-]', ' ', match_text)  # Убираем знаки препинания, оставляем дефисы
-    clean_text = re.sub(r'\s+', ' ', clean_text).strip()  # Убираем лишние пробелы
-    
+
+    def __init__(self, teams):
+        self.root = {}
+        self.parts = set()
+        for team in teams:
+            node = self.root
+            for part in team.lower().split():
+                self.parts.add(part)
+                node = node.setdefault(part, {})
+            node[_END] = team
+
+    def longest_match(self, lowered_words, start):
+        """Сколько слов начиная со start занимает самое длинное известное название (0 - ни одного)"""
+        node = self.root
+        longest = 0
+        for i in range(start, len(lowered_words)):
+            node = node.get(lowered_words[i])
+            if node is None:
+                break
+            if _END in node:
+                longest = i - start + 1
+        return longest
+
+    def is_team_part(self, word):
+        """Является ли слово частью какого-нибудь известного названия"""
+        return word.lower() in self.parts
+
+
+TEAM_MATCHER = TeamMatcher(dict.fromkeys(KNOWN_TEAMS + TEAMS))
+
+
+def _split_by_words(match_text):
+    # Очищаем текст от лишних символов и убираем лишние пробелы
+    clean_text = PUNCTUATION_RE.sub(' ', match_text)
+    clean_text = SPACES_RE.sub(' ', clean_text).strip()
+
     # Разбиваем текст на слова
     words = clean_text.split()
-    
+    lowered_words = [word.lower() for word in words]
+
     teams = []
     current_team = []
-    
-    # Паттерны для пропуска
-    skip_patterns = [
-        r'^\d{1,2}:\d{1,2}$',  # время (13:30)
-        r'^\d+[:]\d+$',         # счет (0:2, 4:3)
-        r'^окончен$',           # статус матча
-        r'^ОТ$',                # овертайм
-        r'^Б$',                 # буллиты
-    ]
-    
+
     i = 0
     while i < len(words):
         word = words[i]
-        
+
         # Пропускаем служебные слова
-        if any(re.match(pattern, word) for pattern in skip_patterns):
+        if SKIP_RE.match(word):
             i += 1
             continue
-        
+
         # Если это тире между командами
-        if word in ['–', '-', '—']:
+        if word in DASHES:
             if current_team:
                 teams.append(' '.join(current_team))
                 current_team = []
             i += 1
             continue
-        
-        # Проверяем, является ли слово частью известной команды
-        is_team_part = False
-        for known_team in KNOWN_TEAMS:
-            known_parts = known_team.lower().split()
-            # Проверяем, совпадает ли текущее слово с частью известной команды
-            if word.lower() in [part.lower() for part in known_parts]:
-                is_team_part = True
-                break
-        
+
+        # Известное название из нескольких слов добавляем к команде целиком
+        matched = TEAM_MATCHER.longest_match(lowered_words, i)
+        if matched:
+            current_team.extend(words[i:i + matched])
+            i += matched
+            continue
+
         # Если это часть команды, добавляем к текущей команде
-        if is_team_part or (not word.isdigit() and len(word) > 1):
+        if TEAM_MATCHER.is_team_part(word) or (not word.isdigit() and len(word) > 1):
             current_team.append(word)
         elif current_team:
             # Если нашли не-командное слово после командных слов, заканчиваем текущую команду
             teams.append(' '.join(current_team))
             current_team = []
-        
+
         i += 1
-    
+
     # Добавляем последнюю команду, если есть
     if current_team:
         teams.append(' '.join(current_team))
-    
+
     # Фильтруем результат - оставляем только команды с 2+ символами
-    teams = [team for team in teams if len(team) >= 2]
-    
+    return [team for team in teams if len(team) >= 2]
+
+
+def extract_teams_from_match_text(match_text):
+    """
+    Извлекает названия команд из текста матча
+    Возвращает список: ['team1', 'team2']
+    """
+    teams = _split_by_words(match_text)
+
     # Если нашли ровно 2 команды - возвращаем их
     if len(teams) == 2:
         return teams
-    
+
     # Альтернативный подход: ищем по формату "команда1 – команда2"
-    pattern1 = r'([А-Яа-яA-Za-z\s]+)\s*[–\-]\s*([А-Яа-яA-Za-z\s]+)'
-    matches1 = re.findall(pattern1, match_text)
+    matches1 = TEAMS_WITH_DASH_RE.findall(match_text)
     if matches1:
         team1, team2 = matches1[0]
         return [team1.strip(), team2.strip()]
-    
+
     # Еще один паттерн: ищем две группы слов перед и после тире
     words = match_text.split()
     dash_index = -1
     for i, word in enumerate(words):
-        if word in ['–', '-', '—']:
+        if word in DASHES:
             dash_index = i
             break
-    
+
     if dash_index > 0 and dash_index < len(words) - 1:
         # Берем слова до тире как первую команду
         team1_words = []
         for j in range(dash_index - 1, -1, -1):
-            if re.match(r'^\d{1,2}:\d{1,2}$', words[j]) or words[j].isdigit():
+            if TIME_RE.match(words[j]) or words[j].isdigit():
                 break
             team1_words.insert(0, words[j])
-        
+
         # Берем слова после тире как вторую команду
         team2_words = []
         for j in range(dash_index + 1, len(words)):
-            if re.match(r'^\d+[:]\d+$', words[j]) or words[j] in ['окончен', 'ОТ', 'Б']:
+            if SCORE_RE.match(words[j]) or words[j] in TEAM2_STOP_WORDS:
                 break
             team2_words.append(words[j])
-        
+
         if team1_words and team2_words:
             return [' '.join(team1_words), ' '.join(team2_words)]
-    
+
     return teams[:2]  # Возвращаем максимум 2 команды
+
+
+def extract_teams_many(match_texts):
+    """Пакетный вариант: список пар команд для списка текстов матчей"""
+    return [extract_teams_from_match_text(text) for text in match_texts]
@@ -1,52 +1,159 @@
-from tools.read_data_from_page import get_js_data_with_selenium
-import time
+from tools.read_data_from_page import (
+    get_js_data_with_selenium,
+    MATCH_WORKERS,
+    DEFAULT_ENGINE,
+)
+import os
+from concurrent.futures import ThreadPoolExecutor
 from tools.database_tools.generate_db import *
-from tools.cache_tools.load_from_cache import load_from_cache
+from tools.cache_tools.load_from_cache import load_from_cache, DAY_NAMESPACE
 from tools.cache_tools.save_to_cache import save_to_cache
-from tools.json_tools.save_to_json import save_to_json
+from tools.cache_tools.cache_policy import day_ttl
+from tools.cache_tools.cache_db import get_cache_db
+from tools.json_tools.save_to_json import save_to_json, store_path_for
+from tools.json_tools.match_store import get_match_store
 from datetime import datetime, timedelta
-from tools.add_position import update_db_schema_and_insert_positions
+from tools.selenium_tools.driver_pool import DriverPool, MAX_PAGES_PER_DRIVER
+from tools.selenium_tools.wait_for_page import print_wait_stats
+from tools.progress import Progress
+from tools.snapshot_tools.snapshot_store import configure_snapshots, SNAPSHOT_DIR
 
+BASE_URL = "https://www.championat.com"
 
-def runner(days, league):
+
+def load_day_matches(
+    url,
+    league,
+    pool,
+    match_workers=MATCH_WORKERS,
+    engine=DEFAULT_ENGINE,
+    known_urls=None,
+    progress=None,
+):
+    """Загружает матчи одного дня: из кэша или через браузер из пула"""
+    print(f"Парсим страницу: {url}")
+    progress = progress or Progress()
+
+    # Пробуем загрузить из кэша
+    cached_data = load_from_cache(url, league)
+    if cached_data is not None:
+        progress.cache_hit(url, DAY_NAMESPACE)
+        return cached_data
+
+    failed = []
+    matches = get_js_data_with_selenium(
+        url,
+        league,
+        pool=pool,
+        match_workers=match_workers,
+        engine=engine,
+        known_urls=known_urls,
+        progress=progress,
+        failed=failed,
+    )
+    if matches:
+        save_to_cache(
+            url, matches, league, ttl=day_ttl(url, matches, failed=len(failed))
+        )
+    return matches
+
+
+def runner(
+    days,
+    league,
+    workers=1,
+    match_workers=MATCH_WORKERS,
+    max_pages=MAX_PAGES_PER_DRIVER,
+    engine=DEFAULT_ENGINE,
+    output_dir=".",
+    events=None,
+    snapshots=False,
+    base_url=BASE_URL,
+):
+    """
+    Парсит матчи за последние days дней.
+    workers - сколько страниц дней парсится одновременно, каждая на своем браузере.
+    match_workers - сколько страниц матчей одного дня загружается параллельно.
+    Всего браузеров в пуле не больше max(workers, match_workers).
+    engine - как грузить страницы матчей: "selenium" или "http" (без браузера).
+    Результаты сливаются в matches_data.json в порядке дат, как и при workers=1.
+    output_dir - каталог для matches_data.json и hockey_matches.db, чтобы
+    параллельные запуски не писали в одни и те же файлы.
+    events - очередь (метод put), в которую отправляются события хода
+    парсинга из tools/progress.py, например чтобы бот показывал прогресс.
+    snapshots - сохранять сжатый HTML загруженных страниц в SNAPSHOT_DIR,
+    чтобы потом пересобрать данные без сети (tools/reparse.py).
+    Страницы, взятые из кэша, не загружаются и снимков не получают.
+    base_url - адрес сайта; подменяется на локальный сервер в бенчмарках.
+    Возвращает пути к получившимся файлам и длительности этапов:
+    {"json": ..., "db": ..., "timings": ...}.
+    """
     urls = []
     today = datetime.now().date()
 
     for i in range(1, days + 1):
         day = today - timedelta(days=i)
         urls.append(
-            f"https://www.championat.com/stat/hockey/#{day.strftime('%Y-%m-%d')}"
+            f"{base_url}/stat/hockey/#{day.strftime('%Y-%m-%d')}"
         )
 
+    workers = max(1, min(workers, len(urls)))
+
+    os.makedirs(output_dir, exist_ok=True)
+    json_path = os.path.join(output_dir, JSON_PATH)
+    db_path = os.path.join(output_dir, DB_PATH)
+
+    progress = Progress(events)
+    configure_snapshots(SNAPSHOT_DIR if snapshots else None)
+
     print("Запуск улучшенного парсера...")
-    with open("./matches_data.json", "w"):
+    store = get_match_store(store_path_for(json_path))
+    store.clear()
+    # Один пул браузеров на весь запуск: Chrome стартует один раз, а не на каждый день
+    with DriverPool(
+        max(workers, match_workers), max_pages
+    ) as pool:
         all_new_matches = []
-        start = time.time()
-        for url in urls:
-            print(f"Парсим страницу: {url}")
-
-            # Пробуем загрузить из кэша
-            cached_data = load_from_cache(url)
-            if cached_data is not None:
-                matches = cached_data
-            else:
-                matches = get_js_data_with_selenium(url, league)
-                if matches:
-                    save_to_cache(url, matches)
-
-            if matches:
-                # Сохраняем полученные матчи
-                added_count = save_to_json(matches)
-                all_new_matches.extend(matches)
-                print(f"С страницы {url} добавлено {added_count} матчей")
-            else:
-                print(f"На странице {url} не найдено новых матчей")
-
-        print(f"Общее время: {round(time.time() - start, 3)} секунд")
-
-        start = time.time()
-        # Вместо файла используем память
-
-        create_hockey_database("matches_data.json")
-        update_db_schema_and_insert_positions()
-        print(f"Время на создание db - {round(time.time() - start, 3)} секунд")
+
+        def load_day(day, url):
+            with progress.day(url, day, len(urls)) as found:
+                matches = load_day_matches(
+                    url,
+                    league,
+                    pool,
+                    match_workers,
+                    engine,
+                    store.url_snapshot(),
+                    progress,
+                )
+                found.extend(matches or [])
+            return matches
+
+        with progress.stage("scrape", "парсинг страниц"):
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # map отдает результаты в порядке urls, поэтому слияние детерминировано
+                results = executor.map(load_day, range(1, len(urls) + 1), urls)
+                for url, matches in zip(urls, results):
+                    if matches:
+                        # Сохраняем полученные матчи, дубликаты URL отсекает save_to_json
+                        added_count = save_to_json(matches, json_path)
+                        all_new_matches.extend(matches)
+                        print(f"С страницы {url} добавлено {added_count} матчей")
+                    else:
+                        print(f"На странице {url} не найдено новых матчей")
+
+        print_wait_stats()
+        memory_stats = get_cache_db().memory.stats()
+        print(
+            f"Кэш в памяти: попаданий {memory_stats['hits']}, "
+            f"промахов {memory_stats['misses']}, записей {memory_stats['entries']}"
+        )
+
+        with progress.stage("export_json", "выгрузку json"):
+            store.export_json(json_path)
+
+        with progress.stage("database", "создание db"):
+            create_hockey_database(json_path, db_path, incremental=True)
+
+    progress.print_summary()
+    return {"json": json_path, "db": db_path, "timings": progress.summary()}
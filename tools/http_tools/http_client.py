@@ -0,0 +1,39 @@
+import threading
+import httpx
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+MAX_CONNECTIONS = 8
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """
+    Возвращает общий httpx.Client с пулом keep-alive соединений.
+    Клиент создается один раз на процесс и используется из всех потоков.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_CONNECTIONS,
+                ),
+                timeout=10,
+                follow_redirects=True,
+            )
+        return _client
+
+
+def fetch_html(url):
+    """Загружает страницу без браузера, возвращает HTML или None при ошибке"""
+    try:
+        response = get_http_client().get(url)
+        response.raise_for_status()
+        return response.text
+    except httpx.HTTPError as e:
+        print(f"Ошибка загрузки {url}: {e}")
+        return None
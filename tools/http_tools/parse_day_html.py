@@ -0,0 +1,81 @@
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+from tools.http_tools.parse_match_html import VOID_TAGS, BREAK_TAGS
+
+
+class _DayPageParser(HTMLParser):
+    """
+    Собирает из HTML страницы дня элементы с классом class_name:
+    их текст и ссылку (первая <a> внутри или href самого элемента).
+    """
+
+    def __init__(self, class_name, base_url):
+        super().__init__(convert_charrefs=True)
+        self.class_name = class_name
+        self.base_url = base_url
+        self.items = []
+        # Стек открытых тегов: (тег, элемент, открытый этим тегом, или None)
+        self._stack = []
+        self._open_items = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BREAK_TAGS:
+            self.handle_data("\n")
+        if tag in VOID_TAGS:
+            return
+        attrs = dict(attrs)
+        href = attrs.get("href")
+        item = None
+        if self.class_name in (attrs.get("class") or "").split():
+            item = {"chunks": [], "href": None, "own_href": href}
+            self.items.append(item)
+            self._open_items.append(item)
+        if tag == "a" and href:
+            for open_item in self._open_items:
+                if open_item["href"] is None and open_item is not item:
+                    open_item["href"] = href
+        self._stack.append((tag, item))
+
+    def handle_endtag(self, tag):
+        if tag in BREAK_TAGS:
+            self.handle_data("\n")
+        if not any(open_tag == tag for open_tag, _ in self._stack):
+            return
+        # Закрываем все теги до парного, как это делает браузер
+        while self._stack:
+            open_tag, item = self._stack.pop()
+            if item is not None:
+                self._open_items.remove(item)
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        for item in self._open_items:
+            item["chunks"].append(data)
+
+    def result(self):
+        items = []
+        for item in self.items:
+            href = item["href"] or item["own_href"]
+            text = "".join(item["chunks"])
+            # Как innerText: пробелы внутри строк схлопываются, пустые строки убираются
+            lines = [re.sub(r"\s+", " ", line).strip() for line in text.split("\n")]
+            items.append(
+                {
+                    "text": "\n".join(line for line in lines if line),
+                    "href": urljoin(self.base_url, href) if href else None,
+                }
+            )
+        return items
+
+
+def parse_day_html(html, base_url, class_name="results-item"):
+    """
+    Разбирает сохраненный HTML страницы дня в тот же формат, что и
+    RESULTS_ITEMS_SCRIPT: список {"text", "href"} с абсолютными ссылками.
+    """
+    parser = _DayPageParser(class_name, base_url)
+    parser.feed(html)
+    parser.close()
+    return parser.result()
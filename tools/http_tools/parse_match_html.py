@@ -0,0 +1,124 @@
+import re
+from html.parser import HTMLParser
+
+# Теги без закрывающей пары, их не кладем в стек
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "source", "track", "wbr",
+}
+
+# Теги, на границе которых браузер разрывает текст (как element.text в Selenium)
+BREAK_TAGS = {"br", "p", "div", "li", "tr", "td", "th", "table", "ul", "ol"}
+
+FIELD_CLASSES = {
+    "table-item__name": "names",
+    "table-item__amplua": "positions",
+    "match-stat__player": "goals",
+    "match-info__extra-row": "extra",
+}
+
+
+def _clean_text(chunks):
+    return re.sub(r"\s+", " ", "".join(chunks)).strip()
+
+
+class _MatchPageParser(HTMLParser):
+    """Собирает текст элементов с нужными классами из статического HTML"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.payload = {"names": [], "positions": [], "goals": [], "extra": []}
+        # Стек открытых тегов: (тег, список буферов, открытых этим тегом)
+        self._stack = []
+        self._buffers = []
+        self._extra_row = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BREAK_TAGS:
+            self.handle_data(" ")
+        if tag in VOID_TAGS:
+            return
+        opened = []
+        classes = (dict(attrs).get("class") or "").split()
+        for class_name in classes:
+            field = FIELD_CLASSES.get(class_name)
+            if field is None:
+                continue
+            if field == "extra":
+                row = {"chunks": [], "link": None, "link_chunks": None}
+                self.payload["extra"].append(row)
+                self._extra_row = row
+                opened.append(("extra", row))
+            else:
+                chunks = []
+                self.payload[field].append(chunks)
+                opened.append((field, chunks))
+
+        # Стадион - первая ссылка в строке доп. информации
+        row = self._extra_row
+        if tag == "a" and row is not None and row["link_chunks"] is None:
+            row["link_chunks"] = []
+            opened.append(("link", row))
+
+        self._stack.append((tag, opened))
+        self._buffers.extend(opened)
+
+    def handle_endtag(self, tag):
+        if tag in BREAK_TAGS:
+            self.handle_data(" ")
+        if not any(open_tag == tag for open_tag, _ in self._stack):
+            return
+        # Закрываем все теги до парного, как это делает браузер
+        while self._stack:
+            open_tag, opened = self._stack.pop()
+            for buffer in opened:
+                # У вложенных элементов одного класса буферы равны по значению,
+                # поэтому удаляем именно этот объект, а не первый равный
+                index = next(i for i, b in enumerate(self._buffers) if b is buffer)
+                del self._buffers[index]
+                if buffer[0] == "extra":
+                    self._extra_row = None
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        for field, buffer in self._buffers:
+            if field == "extra":
+                buffer["chunks"].append(data)
+            elif field == "link":
+                buffer["link_chunks"].append(data)
+            else:
+                buffer.append(data)
+
+    def result(self):
+        payload = {
+            field: [_clean_text(chunks) for chunks in self.payload[field]]
+            for field in ("names", "positions", "goals")
+        }
+        payload["extra"] = [
+            {
+                "text": _clean_text(row["chunks"]),
+                "link": (
+                    _clean_text(row["link_chunks"])
+                    if row["link_chunks"] is not None
+                    else None
+                ),
+            }
+            for row in self.payload["extra"]
+        ]
+        return payload
+
+
+def parse_match_html(html):
+    """
+    Разбирает HTML страницы матча в тот же формат, что и read_match_payload.
+    Возвращает None, если на странице нет разметки составов
+    (например, она подгружается скриптом) - тогда нужен браузер.
+    """
+    parser = _MatchPageParser()
+    parser.feed(html)
+    parser.close()
+    payload = parser.result()
+    if not payload["names"] or not payload["positions"]:
+        return None
+    return payload
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from nameparser import HumanName
 
 TEAMS = [
@@ -54,6 +55,15 @@ BLACKLIST = [
     'фиштаун', 'пингвинз', 'лукко', 'айсберен', 'берлин', 'гренобль'
 ]
 
+# Проверки, собранные один раз при импорте: одно регулярное выражение
+# на весь черный список (поиск подстроки) и множество названий команд
+BLACKLIST_RE = re.compile(
+    "|".join(re.escape(banned) for banned in sorted(set(BLACKLIST), key=len, reverse=True))
+)
+TEAMS_SET = frozenset(TEAMS)
+INVALID_CHARS_RE = re.compile(r'[!@#$%^&*()_+=\[\]{};:"\\|,<>/?]')
+VALID_NAMES_CACHE_SIZE = 8192
+
 
 def _check_basic_string_format(name):
     if not name or len(name) < 3 or len(name) > 50:
@@ -66,7 +76,7 @@ def _check_invalid_characters(name):
         return True
     
     # Проверка на спецсимволы
-    if re.search(r'[!@#$%^&*()_+=\[\]{};:"\\|,<>/?]', name):
+    if INVALID_CHARS_RE.search(name):
         return True
     
     return False
@@ -102,17 +112,11 @@ def _validate_word_structure(name):
 
 
 def _check_against_blacklist(name):
-    lower_name = name.lower()
-    
-    for banned in BLACKLIST:
-        if banned in lower_name:
-            return True
-    
-    return False
+    return BLACKLIST_RE.search(name.lower()) is not None
 
 
 def _check_team_name(name):
-    return name in TEAMS
+    return name in TEAMS_SET
 
 
 def _check_uppercase_abbreviation(name):
@@ -122,6 +126,35 @@ def _check_uppercase_abbreviation(name):
 
 
 def is_valid_player(name):
+    # Одни и те же игроки встречаются в каждом матче, поэтому строки кэшируются
+    if isinstance(name, str):
+        return _is_valid_player_cached(name)
+    return _is_valid_player(name)
+
+
+def validate_many(names):
+    """Проверяет сразу весь состав: список True/False в порядке names"""
+    return [is_valid_player(name) for name in names]
+
+
+def filter_lineup_names(names):
+    """
+    Имена игроков из ячеек состава на странице матча, в исходном порядке.
+    Названия команд и слова из них отсекает сама валидация (TEAMS и BLACKLIST).
+    """
+    return [
+        text
+        for text, valid in zip(names, validate_many(names))
+        if text and valid and len(text.split()) < 3
+    ]
+
+
+@lru_cache(maxsize=VALID_NAMES_CACHE_SIZE)
+def _is_valid_player_cached(name):
+    return _is_valid_player(name)
+
+
+def _is_valid_player(name):
     try:
         name = name.strip()
         
@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+
+STORE_PATH = "matches_data.jsonl"
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class MatchStore:
+    """
+    Хранилище матчей в формате JSON Lines: одна строка - один матч.
+    Новые матчи только дописываются в конец, а рядом лежит индекс URL
+    (файл .urls, один URL на строку), поэтому каждый матч пишется на диск
+    один раз, без перечитывания и перезаписи всего файла.
+    """
+
+    def __init__(self, filename=STORE_PATH):
+        self.filename = filename
+        self.index_filename = filename + ".urls"
+        self._lock = threading.Lock()
+        self.urls = self._load_index()
+
+    def _load_index(self):
+        if os.path.exists(self.index_filename):
+            with open(self.index_filename, "r", encoding="utf-8") as f:
+                return {line.rstrip("\n") for line in f if line.strip()}
+        # Индекса нет - восстанавливаем его по самим данным
+        urls = {match["url"] for match in self.iter_matches()}
+        self._write_index(urls)
+        return urls
+
+    def _write_index(self, urls):
+        tmp_filename = self.index_filename + ".tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as f:
+            for url in urls:
+                f.write(url + "\n")
+        os.replace(tmp_filename, self.index_filename)
+
+    def __contains__(self, url):
+        with self._lock:
+            return url in self.urls
+
+    def __len__(self):
+        with self._lock:
+            return len(self.urls)
+
+    def url_snapshot(self):
+        """Копия множества URL, безопасная для использования из других потоков"""
+        with self._lock:
+            return set(self.urls)
+
+    def iter_matches(self):
+        """Построчно читает матчи из хранилища"""
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Недописанная строка после аварийного завершения
+                    print(f"Пропускаем поврежденную строку в {self.filename}")
+
+    def append(self, matches):
+        """Дописывает матчи, которых еще нет в хранилище. Возвращает их количество"""
+        with self._lock:
+            new_matches = []
+            for match in matches:
+                if match["url"] not in self.urls:
+                    new_matches.append(match)
+                    self.urls.add(match["url"])
+
+            if new_matches:
+                with open(self.filename, "a", encoding="utf-8") as f:
+                    for match in new_matches:
+                        f.write(json.dumps(match, ensure_ascii=False) + "\n")
+                with open(self.index_filename, "a", encoding="utf-8") as f:
+                    for match in new_matches:
+                        f.write(match["url"] + "\n")
+            return len(new_matches)
+
+    def clear(self):
+        """Очищает хранилище и индекс"""
+        with self._lock:
+            for filename in (self.filename, self.index_filename):
+                with open(filename, "w", encoding="utf-8"):
+                    pass
+            self.urls = set()
+
+    def compact(self):
+        """
+        Переписывает хранилище без дубликатов и поврежденных строк
+        и заново строит индекс URL. Возвращает количество матчей.
+        """
+        with self._lock:
+            urls = set()
+            tmp_filename = self.filename + ".tmp"
+            with open(tmp_filename, "w", encoding="utf-8") as f:
+                for match in self.iter_matches():
+                    if match["url"] in urls:
+                        continue
+                    urls.add(match["url"])
+                    f.write(json.dumps(match, ensure_ascii=False) + "\n")
+            os.replace(tmp_filename, self.filename)
+            self._write_index(urls)
+            self.urls = urls
+            return len(urls)
+
+    def export_json(self, filename="matches_data.json"):
+        """Выгружает матчи в прежний формат {"matches": [...]} одним проходом"""
+        matches = []
+        source_urls = []
+        seen_urls = set()
+        with self._lock:
+            for match in self.iter_matches():
+                if match["url"] in seen_urls:
+                    continue
+                seen_urls.add(match["url"])
+                matches.append(match)
+                source_url = match.get("source_url")
+                if source_url and source_url not in source_urls:
+                    source_urls.append(source_url)
+
+        data = {
+            "matches": matches,
+            "source_urls": source_urls,
+            "matches_found": len(matches),
+        }
+        tmp_filename = filename + ".tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_filename, filename)
+        return len(matches)
+
+
+def get_match_store(filename=STORE_PATH):
+    """Возвращает общий для процесса MatchStore для файла filename"""
+    path = os.path.abspath(filename)
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = MatchStore(filename)
+        return _stores[path]
@@ -1,29 +1,20 @@
-from tools.json_tools.load_existing_data import load_existing_data
-import json
+from tools.json_tools.match_store import get_match_store
+import os
+
+
+def store_path_for(filename):
+    """matches_data.json -> matches_data.jsonl"""
+    return os.path.splitext(filename)[0] + ".jsonl"
+
 
 def save_to_json(data, filename="matches_data.json"):
-    """Сохраняет данные в JSON, добавляя к существующим"""
-    existing_data = load_existing_data(filename)
-    
-    existing_urls = {match['url'] for match in existing_data.get('matches', [])}
-    
-    new_matches = []
-    for match in data:
-        if match['url'] not in existing_urls:
-            new_matches.append(match)
-            existing_urls.add(match['url'])
-    
-    existing_data['matches'].extend(new_matches)
-    existing_data['matches_found'] = len(existing_data['matches'])
-    
-    if 'source_url' in data[0] if data else False:
-        source_url = data[0]['source_url']
-        if source_url not in existing_data.get('source_urls', []):
-            existing_data.setdefault('source_urls', []).append(source_url)
-    
-    
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(existing_data, f, ensure_ascii=False, indent=2)
-    
-    print(f"Добавлено новых матчей: {len(new_matches)}")
-    return len(new_matches)
\ No newline at end of file
+    """
+    Сохраняет новые матчи, добавляя к существующим.
+    Матчи дописываются в JSONL-хранилище рядом с filename, сам filename
+    собирается один раз через get_match_store(...).export_json(filename).
+    """
+    store = get_match_store(store_path_for(filename))
+    added_count = store.append(data)
+
+    print(f"Добавлено новых матчей: {added_count}")
+    return added_count
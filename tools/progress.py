@@ -0,0 +1,104 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# События хода парсинга. Каждое событие - словарь с ключами
+# "event" (одна из констант ниже), "time" и полями конкретного события.
+DAY_STARTED = "day_started"  # url, day, days
+DAY_FINISHED = "day_finished"  # url, day, days, matches, duration
+MATCH_PARSED = "match_parsed"  # url, duration
+CACHE_HIT = "cache_hit"  # url, namespace ("day" или "match")
+STAGE_STARTED = "stage_started"  # stage
+STAGE_FINISHED = "stage_finished"  # stage, duration
+
+
+class Progress:
+    """
+    Собирает длительности этапов парсинга и отправляет события о ходе работы
+    в sink - любой объект с методом put (queue.Queue, очередь Manager
+    для передачи событий из процесса-воркера в бота). Без sink события
+    не отправляются, но длительности все равно считаются и печатаются.
+    Методы можно вызывать из нескольких потоков.
+    """
+
+    def __init__(self, sink=None):
+        self.sink = sink
+        self.durations = {}
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def _add(self, name, duration=None):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+            if duration is not None:
+                self.durations[name] = self.durations.get(name, 0) + duration
+
+    def emit(self, event, **fields):
+        if self.sink is None:
+            return
+        fields["event"] = event
+        fields["time"] = time.time()
+        try:
+            self.sink.put(fields)
+        except Exception as e:
+            # Потерянное событие не должно ронять парсинг
+            print(f"Не удалось отправить событие {event}: {e}")
+
+    @contextmanager
+    def stage(self, name, label=None):
+        """Замеряет этап (name) и печатает его длительность"""
+        self.emit(STAGE_STARTED, stage=name)
+        start = time.time()
+        try:
+            yield
+        finally:
+            duration = time.time() - start
+            self._add(name, duration)
+            print(f"Время на {label or name} - {round(duration, 3)} секунд")
+            self.emit(STAGE_FINISHED, stage=name, duration=duration)
+
+    @contextmanager
+    def day(self, url, day, days):
+        """Замеряет загрузку страницы дня; в блок передается список для найденных матчей"""
+        self.emit(DAY_STARTED, url=url, day=day, days=days)
+        start = time.time()
+        found = []
+        try:
+            yield found
+        finally:
+            duration = time.time() - start
+            self._add("day_pages", duration)
+            self.emit(
+                DAY_FINISHED,
+                url=url,
+                day=day,
+                days=days,
+                matches=len(found),
+                duration=duration,
+            )
+
+    def match_parsed(self, url, duration):
+        self._add("match_pages", duration)
+        self.emit(MATCH_PARSED, url=url, duration=duration)
+
+    def cache_hit(self, url, namespace):
+        self._add(f"cache_hits_{namespace}")
+        self.emit(CACHE_HIT, url=url, namespace=namespace)
+
+    def summary(self):
+        """Количества и длительности по этапам: {name: {"count": ..., "seconds": ...}}"""
+        with self._lock:
+            summary = {}
+            for name, count in self.counts.items():
+                summary[name] = {"count": count}
+                if name in self.durations:
+                    summary[name]["seconds"] = round(self.durations[name], 3)
+            return summary
+
+    def print_summary(self):
+        print("Этапы парсинга:")
+        for name, stats in self.summary().items():
+            line = f"  {name}: {stats['count']}"
+            if "seconds" in stats:
+                line += f", {stats['seconds']} секунд"
+            print(line)
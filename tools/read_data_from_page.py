@@ -1,20 +1,49 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import (
-    TimeoutException,
-    NoSuchElementException,
-    StaleElementReferenceException,
-)
 import time
-from tools.is_valid_name import TEAMS, is_valid_player
-from random import randint
-from tools.json_tools.load_existing_data import load_existing_data
+from concurrent.futures import ThreadPoolExecutor
+from tools.is_valid_name import filter_lineup_names
+from tools.json_tools.match_store import get_match_store
 from tools.extract_teams_from_match_text import extract_teams_from_match_text
+from tools.selenium_tools.driver_pool import DriverPool
+from tools.selenium_tools.page_scripts import MATCH_PAGE_SCRIPT, RESULTS_ITEMS_SCRIPT
+from tools.selenium_tools.wait_for_page import wait_for_page
+from tools.http_tools.http_client import fetch_html
+from tools.cache_tools.match_cache import (
+    load_match_from_cache,
+    save_match_to_cache,
+    MATCH_NAMESPACE,
+)
+from tools.cache_tools.cache_policy import match_ttl
+from tools.http_tools.parse_match_html import parse_match_html
+from tools.progress import Progress
+from tools.snapshot_tools.snapshot_store import (
+    get_snapshot_store,
+    save_snapshot,
+    DAY_KIND,
+    MATCH_KIND,
+)
 import re
 
+# Сколько страниц матчей одного дня загружается одновременно
+MATCH_WORKERS = 4
+
+# Селекторы блоков матчей на странице дня
+MATCH_SELECTORS = [
+    ".results-item",
+]
+# ".tournament-item", ".js-match-item"
+
+# Признаки готовности страниц и сколько секунд ждать каждый из них.
+# Страница готова, когда появились все селекторы; стадион (extra-row)
+# может прийти раньше составов, поэтому ждем и их
+DAY_READY_SELECTORS = {".results-item": 7}
+MATCH_READY_SELECTORS = {".table-item__name": 5, ".match-info__extra-row": 3}
+# Без составов разбирать страницу матча бессмысленно
+MATCH_REQUIRED_SELECTOR = ".table-item__name"
+
+# Движки загрузки страниц матчей: браузер или простой HTTP-запрос
+ENGINES = ("selenium", "http")
+DEFAULT_ENGINE = "selenium"
+
 
 def make_teams(player_names, positions):
     team1_lineup = []
@@ -33,325 +62,361 @@ def make_teams(player_names, positions):
     return team1_lineup, team2_lineup
 
 
-def parse_match_lineups(driver, match_url, score_team1, score_team2, team1, team2):
-    """Парсит составы команд на странице матча и разделяет на две команды"""
+def read_match_payload(driver):
+    """
+    Считывает со страницы матча сырые данные для build_match_stats:
+    имена, амплуа, авторов голов и строки доп. информации.
+    Все данные приходят одним вызовом execute_script.
+    """
+    return driver.execute_script(MATCH_PAGE_SCRIPT)
+
+
+def build_match_stats(payload, score_team1, score_team2):
+    """
+    Собирает статистику матча из сырых данных страницы
+    (см. read_match_payload и tools.http_tools.parse_match_html).
+    """
+    player_positions = payload["positions"]
+    goals_texts = payload["goals"]
+
+    # Списки для хранения игроков и голов
+    stadion = ""
+    city = ""
+    viewers: int = 0
+    attendance_percent: int = 0
+    max_capacity: int = 0
+
+    """
+    Парсинг стадиона и города
+    """
     try:
-        main_window = driver.current_window_handle
+        for extra_row in payload["extra"]:
+            full_text = extra_row["text"]
+            if not full_text:
+                continue
 
-        # Открываем матч в новой вкладке
-        driver.execute_script("window.open('');")
-        driver.switch_to.window(driver.window_handles[1])
-        driver.get(match_url)
+            print(f"Доп. информация: {full_text}")
 
-        WebDriverWait(driver, 3).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        time.sleep(1)
-
-        # Ищем все элементы с именами игроков
-        player_elements = driver.find_elements(By.CLASS_NAME, "table-item__name")
-        player_positions_elements = driver.find_elements(
-            By.CLASS_NAME, "table-item__amplua"
-        )
-        player_positions = [
-            element.text.strip() for element in player_positions_elements
-        ]
-
-        # Ищем элементы с голами
-        goals_elements_team1 = driver.find_elements(
-            By.CSS_SELECTOR, ".match-stat__player"
-        )
-        # Списки для хранения игроков и голов
-        stadion = ""
-        city = ""
-        viewers: int = 0
-        attendance_percent: int = 0
-        max_capacity: int = 0
+            # Пропускаем блоки с судьями
+            if any(
+                word in full_text.lower()
+                for word in ["судья", "линейный", "рефери"]
+            ):
+                print("Пропускаем блок с судьями")
+                continue
 
-        """
-        Парсинг стадиона и города
-        """
-        try:
-            extra_info_elements = driver.find_elements(
-                By.CSS_SELECTOR, ".match-info__extra-row"
-            )
+            # Это должен быть блок со стадионом
+            if extra_row["link"] is None:
+                print("Не удалось найти стадион")
+                continue
+            stadion = extra_row["link"]
+            print(f"Найден стадион: {stadion}")
+
+            # Парсим город из текста
+
+            # Ищем город в скобках: "Мегаспорт (Москва, Россия)"
+            city_match = re.search(r"\((.*?),\s*[А-Яа-я]+\)", full_text)
+            if city_match:
+                city = city_match.group(1).strip()
+                print(f"Найден город: {city}")
+
+            # Ищем все числа в тексте
+            numbers = re.findall(r"\d[\d\s]*\d", full_text)
+            numbers_clean = [int(num.replace(" ", "")) for num in numbers]
+            print(f"Найдены числа: {numbers_clean}")
+
+            # Распределяем числа
+            if len(numbers_clean) >= 1:
+                viewers = numbers_clean[0]
+            if len(numbers_clean) >= 2:
+                attendance_percent = numbers_clean[1]
+            if len(numbers_clean) >= 3:
+                max_capacity = numbers_clean[2]
+
+    except Exception as e:
+        print(f"Ошибка в парсинге доп статистики: {e}")
 
-            for extra_element in extra_info_elements:
-                full_text = extra_element.text.strip()
-                if not full_text:
-                    continue
-
-                print(f"Доп. информация: {full_text}")
-
-                # Пропускаем блоки с судьями
-                if any(
-                    word in full_text.lower()
-                    for word in ["судья", "линейный", "рефери"]
-                ):
-                    print("Пропускаем блок с судьями")
-                    continue
-
-                # Это должен быть блок со стадионом
-                try:
-                    # Стадион - первая ссылка в блоке
-                    stadion_link = extra_element.find_element(By.TAG_NAME, "a")
-                    stadion = stadion_link.text.strip()
-                    print(f"Найден стадион: {stadion}")
-                except:
-                    print("Не удалось найти стадион")
-                    continue
-
-                # Парсим город из текста
-
-                # Ищем город в скобках: "Мегаспорт (Москва, Россия)"
-                city_match = re.search(r"\((.*?),\s*[А-Яа-я]+\)", full_text)
-                if city_match:
-                    city = city_match.group(1).strip()
-                    print(f"Найден город: {city}")
-
-                # Ищем все числа в тексте
-                numbers = re.findall(r"\d[\d\s]*\d", full_text)
-                numbers_clean = [int(num.replace(" ", "")) for num in numbers]
-                print(f"Найдены числа: {numbers_clean}")
-
-                # Распределяем числа
-                if len(numbers_clean) >= 1:
-                    viewers = numbers_clean[0]
-                if len(numbers_clean) >= 2:
-                    attendance_percent = numbers_clean[1]
-                if len(numbers_clean) >= 3:
-                    max_capacity = numbers_clean[2]
+    """
+    Парсим игроков и рассыкидываем их по командам
+    """
+    team_1_players, team_2_players = [], []
+    print("Trying to parse players...")
+    # Улучшенная проверка - используем функцию валидации имен
+    player_names = filter_lineup_names(payload["names"])
 
-        except Exception as e:
-            print(f"Ошибка в парсинге доп статистики: {e}")
+    if player_names:
+        team_1_players, team_2_players = make_teams(player_names, player_positions)
 
         """
-        Парсим игроков и рассыкидываем их по командам
+        тут по разным группам с голам и с отсранениями
         """
-        player_names = []
-        team_1_players, team_2_players = [], []
-        print("Trying to parse players...")
-        for i, element in enumerate(player_elements):
-            try:
-                text = element.text.strip()
-                # Улучшенная проверка - используем функцию валидации имен
-                if (
-                    text
-                    and is_valid_player(text)
-                    and len(text) >= 3
-                    and len(text.split()) < 3
-                ):
-                    # Дополнительная проверка: имя не должно быть названием команды
-                    if text not in TEAMS and not any(
-                        team_word in text.lower()
-                        for team_word in [
-                            "торпедо",
-                            "акм",
-                            "ростов",
-                            "динамо",
-                            "химик",
-                            "рязань",
-                            "металлург",
-                            "дизель",
-                            "горняк",
-                            "югра",
-                            "магнитка",
-                        ]
-                    ):
-                        player_names.append(text)
-            except Exception as exc:
-                print(f"{exc}")
-                continue
 
-        if player_names:
-            team_1_players, team_2_players = make_teams(player_names, player_positions)
-
-            """
-            тут по разным группам с голам и с отсранениями
-            """
-
-            team_1_players_goals = []
-            team_2_players_goals, kick_offs = [], []
-
-            for element in goals_elements_team1[: (score_team1 + score_team2)]:
-                text = element.text.strip()
-                if (
-                    text in [block for block in player_names[: len(player_names) // 2]]
-                    and len(team_1_players_goals) <= score_team1
-                ):
-                    team_1_players_goals.append(text)
-                elif (
-                    text in [block for block in player_names[len(player_names) // 2 :]]
-                    and len(team_2_players_goals) <= score_team2
-                ):
-                    team_2_players_goals.append(text)
-
-            while len(team_1_players_goals) < score_team1:
-                team_1_players_goals.append(team_1_players_goals[-1])
-
-            while len(team_2_players_goals) < score_team2:
-                team_2_players_goals.append(team_2_players_goals[-1])
-
-            for element in goals_elements_team1[(score_team1 + score_team2) :]:
-                text = element.text.strip()
-                kick_offs.append(text)
-
-                # Закрываем вкладку и возвращаемся
-        driver.close()
-        driver.switch_to.window(main_window)
-        # driver.refresh()
-        WebDriverWait(driver, 3).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        time.sleep(1)
-        print("%DONE%")
-        return {
-            "stadion": stadion or "Неизвестно",
-            "city": city or "Неизвестно",
-            "viewers": viewers or 0,
-            "attendance_percent": attendance_percent or 0,
-            "max_capacity": max_capacity or viewers + attendance_percent or 0,
-            "lineup_team1": team_1_players,
-            "lineup_team2": team_2_players,
-            "goals_team1": team_1_players_goals,
-            "goals_team2": team_2_players_goals,
-            "kick_offs": kick_offs,
-        }
+        team_1_players_goals = []
+        team_2_players_goals, kick_offs = [], []
+
+        for text in goals_texts[: (score_team1 + score_team2)]:
+            if (
+                text in [block for block in player_names[: len(player_names) // 2]]
+                and len(team_1_players_goals) <= score_team1
+            ):
+                team_1_players_goals.append(text)
+            elif (
+                text in [block for block in player_names[len(player_names) // 2 :]]
+                and len(team_2_players_goals) <= score_team2
+            ):
+                team_2_players_goals.append(text)
+
+        while len(team_1_players_goals) < score_team1:
+            team_1_players_goals.append(team_1_players_goals[-1])
+
+        while len(team_2_players_goals) < score_team2:
+            team_2_players_goals.append(team_2_players_goals[-1])
+
+        for text in goals_texts[(score_team1 + score_team2) :]:
+            kick_offs.append(text)
+
+    print("%DONE%")
+    return {
+        "stadion": stadion or "Неизвестно",
+        "city": city or "Неизвестно",
+        "viewers": viewers or 0,
+        "attendance_percent": attendance_percent or 0,
+        "max_capacity": max_capacity or viewers + attendance_percent or 0,
+        "lineup_team1": team_1_players,
+        "lineup_team2": team_2_players,
+        "goals_team1": team_1_players_goals,
+        "goals_team2": team_2_players_goals,
+        "kick_offs": kick_offs,
+    }
+
+
+def parse_match_lineups(driver, match_url, score_team1, score_team2, team1, team2):
+    """
+    Парсит составы команд на странице матча и разделяет на две команды.
+    Страница открывается прямо в переданном драйвере, без отдельной вкладки.
+    """
+    try:
+        driver.get(match_url)
+
+        found = wait_for_page(driver, MATCH_READY_SELECTORS, "match")
+        if MATCH_REQUIRED_SELECTOR not in found:
+            print(f"Составы не загрузились: {match_url}")
+            return 0
+        if get_snapshot_store() is not None:
+            save_snapshot(match_url, MATCH_KIND, driver.page_source)
+
+        return build_match_stats(read_match_payload(driver), score_team1, score_team2)
 
     except Exception as e:
         print(f"Ошибка при парсинге составов: {e}")
-        try:
-            if len(driver.window_handles) > 1:
-                driver.close()
-                driver.switch_to.window(driver.window_handles[0])
-        except:
-            pass
         return 0
 
 
-def get_js_data_with_selenium(url, league):
-    """Основная функция парсинга"""
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument(
-        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    )
-    options.add_argument("--disable-gpu")
-    options.add_argument("--disable-extensions")
-
-    options.add_argument("--disable-images")
-    # options.add_argument("--disable-javascript")  # осторожно, может сломать сайт
-    options.add_experimental_option(
-        "prefs",
-        {
-            "profile.managed_default_content_settings.images": 2,  # Отключаем изображения
-            "profile.managed_default_content_settings.stylesheets": 2,  # Отключаем CSS
-        },
-    )
+def parse_match_lineups_http(match_url, score_team1, score_team2):
+    """
+    Парсит страницу матча без браузера через общий httpx-клиент.
+    Возвращает None, если в статическом HTML нет разметки составов.
+    """
+    html = fetch_html(match_url)
+    payload = parse_match_html(html) if html else None
+    if payload is not None:
+        save_snapshot(match_url, MATCH_KIND, html)
+    if payload is None:
+        return None
+    try:
+        return build_match_stats(payload, score_team1, score_team2)
+    except Exception as e:
+        print(f"Ошибка при парсинге составов: {e}")
+        return 0
 
-    # Более агрессивные настройки для скорости
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option("useAutomationExtension", False)
 
-    driver = webdriver.Chrome(options=options)
+def fetch_match_details(
+    pool,
+    matches,
+    workers=MATCH_WORKERS,
+    engine=DEFAULT_ENGINE,
+    progress=None,
+    failed=None,
+):
+    """
+    Параллельно загружает страницы матчей и присоединяет составы
+    к соответствующим матчам. При engine="http" страницы грузятся
+    без браузера, а драйвер из пула берется только если в HTML нет составов.
+    Уже разобранные матчи берутся из кэша по URL матча.
+    Матчи без статистики отбрасываются, порядок сохраняется.
+    progress - Progress, в который сообщается о каждом матче.
+    failed - список, в который добавляются URL отброшенных матчей.
+    """
+    progress = progress or Progress()
+
+    def fetch(match_info):
+        cached_stats = load_match_from_cache(match_info["url"])
+        if cached_stats is not None:
+            print(f"Матч из кэша: {match_info['url']}")
+            progress.cache_hit(match_info["url"], MATCH_NAMESPACE)
+            return cached_stats
+        start = time.time()
+        lineup_data = load(match_info)
+        progress.match_parsed(match_info["url"], time.time() - start)
+        if lineup_data:
+            save_match_to_cache(
+                match_info["url"], lineup_data, ttl=match_ttl(match_info)
+            )
+        return lineup_data
+
+    def load(match_info):
+        team_scores = [int(x) for x in match_info["score"].split(":")]
+        if engine == "http":
+            lineup_data = parse_match_lineups_http(
+                match_info["url"], team_scores[0], team_scores[1]
+            )
+            if lineup_data is not None:
+                return lineup_data
+            print(f"В HTML нет составов, используем браузер: {match_info['url']}")
+        try:
+            with pool.driver() as driver:
+                return parse_match_lineups(
+                    driver,
+                    match_info["url"],
+                    team_scores[0],
+                    team_scores[1],
+                    match_info["team1"],
+                    match_info["team2"],
+                )
+        except Exception as e:
+            print(f"Ошибка при загрузке матча {match_info['url']}: {e}")
+            return 0
+
+    if not matches:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(matches)))) as executor:
+        lineups = list(executor.map(fetch, matches))
+
     matches_data = []
+    for match_info, lineup_data in zip(matches, lineups):
+        if lineup_data:
+            match_info["stats"] = lineup_data
+            matches_data.append(match_info)
+        elif failed is not None:
+            failed.append(match_info["url"])
+    return matches_data
+
+
+def get_js_data_with_selenium(
+    url,
+    league,
+    pool=None,
+    match_workers=MATCH_WORKERS,
+    engine=DEFAULT_ENGINE,
+    known_urls=None,
+    progress=None,
+    failed=None,
+):
+    """
+    Основная функция парсинга.
+    Сначала со страницы дня собираются ссылки на матчи, затем страницы
+    матчей загружаются параллельно на match_workers драйверах пула
+    (или HTTP-запросами при engine="http").
+    Если пул не передан, создается временный пул, который закрывается по окончании.
+    known_urls - URL уже сохраненных матчей, по умолчанию из общего MatchStore.
+    failed - список, в который добавляются URL матчей без статистики.
+    """
+    if pool is None:
+        with DriverPool(size=match_workers) as own_pool:
+            return get_js_data_with_selenium(
+                url,
+                league,
+                pool=own_pool,
+                match_workers=match_workers,
+                engine=engine,
+                known_urls=known_urls,
+                progress=progress,
+                failed=failed,
+            )
 
     try:
-        driver.get(url)
-        WebDriverWait(driver, 7).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        time.sleep(1)
-
-        match_selectors = [
-            ".results-item",
-        ]
-        # ".tournament-item", ".js-match-item"
-        processed_urls = set()
-
-        # Загружаем существующие URL чтобы не парсить повторно
-        existing_data = load_existing_data()
-        existing_urls = {match["url"] for match in existing_data.get("matches", [])}
-
-        for selector in match_selectors:
-            try:
-                match_elements = driver.find_elements(By.CSS_SELECTOR, selector)
-
-                for i, element in enumerate(match_elements):
-                    try:
-                        element = driver.find_elements(By.CSS_SELECTOR, selector)[i]
-                        text = element.text.replace("\n", " ").strip()
-                        if not text or len(text) < 10:
-                            continue
-
-                        # Ищем ссылку
-                        match_url = None
-                        try:
-                            link = element.find_element(By.TAG_NAME, "a")
-                            match_url = link.get_attribute("href")
-                        except:
-                            match_url = element.get_attribute("href")
-
-                        if (
-                            not match_url
-                            or match_url in processed_urls
-                            or match_url in existing_urls
-                        ):
-                            continue
-
-                        if league in match_url or league == "all":
-                            processed_urls.add(match_url)
-                            teams = extract_teams_from_match_text(text)
-
-                            scores = [x for x in text.split() if x.isnumeric()]
-                            team1 = teams[0]
-                            team2 = teams[1]
-                            match_info = {
-                                "text": text[:100] + "..." if len(text) > 100 else text,
-                                "team1": team1,
-                                "team2": team2,
-                                "score": scores[0] + ":" + scores[1],
-                                "url": match_url,
-                                # "selector": selector,
-                                "source_url": url,  # Добавляем URL источника
-                            }
-
-                            print(f"Найден матч: {match_info['text']}")
-
-                            # Парсим составы
-                            team_scores = [
-                                int(x) for x in match_info["score"].split(":")
-                            ]
-                            lineup_data = parse_match_lineups(
-                                driver,
-                                match_url,
-                                team_scores[0],
-                                team_scores[1],
-                                team1,
-                                team2,
-                            )
-                            match_info["stats"] = lineup_data
-
-                        if lineup_data:
-                            matches_data.append(match_info)
-
-                    except StaleElementReferenceException:
-                        continue
-                    except Exception as e:
-                        print(f"Ошибка обработки элемента {i}: {e}")
-                        break
-
-            except Exception as e:
-                print(f"Ошибка с селектором {selector}: {e}")
-                break
-
-        return matches_data
-
+        # Драйвер страницы дня возвращается в пул до загрузки матчей,
+        # чтобы он тоже мог участвовать в параллельной загрузке
+        with pool.driver() as driver:
+            matches = _collect_day_matches(driver, url, league, known_urls)
     except Exception as e:
         print(f"Ошибка: {e}")
         return []
-    finally:
-        driver.quit()
+
+    return fetch_match_details(
+        pool, matches, match_workers, engine, progress, failed
+    )
+
+
+def collect_matches(items, url, league, seen_urls):
+    """
+    Отбирает матчи нужной лиги из элементов страницы дня.
+    items - список {"text", "href"}, как его возвращает RESULTS_ITEMS_SCRIPT.
+    seen_urls - URL, которые не нужно парсить; пополняется найденными матчами.
+    """
+    matches_data = []
+    for i, item in enumerate(items):
+        try:
+            text = (item["text"] or "").replace("\n", " ").strip()
+            if not text or len(text) < 10:
+                continue
+
+            match_url = item["href"]
+            if not match_url or match_url in seen_urls:
+                continue
+
+            if league in match_url or league == "all":
+                seen_urls.add(match_url)
+                teams = extract_teams_from_match_text(text)
+
+                scores = [x for x in text.split() if x.isnumeric()]
+                team1 = teams[0]
+                team2 = teams[1]
+                match_info = {
+                    "text": text[:100] + "..." if len(text) > 100 else text,
+                    "team1": team1,
+                    "team2": team2,
+                    "score": scores[0] + ":" + scores[1],
+                    "url": match_url,
+                    # "selector": selector,
+                    "source_url": url,  # Добавляем URL источника
+                }
+
+                print(f"Найден матч: {match_info['text']}")
+                matches_data.append(match_info)
+
+        except Exception as e:
+            print(f"Ошибка обработки элемента {i}: {e}")
+            break
+
+    return matches_data
+
+
+def _collect_day_matches(driver, url, league, known_urls=None):
+    """Собирает со страницы дня матчи нужной лиги (без составов)"""
+    matches_data = []
+
+    # Дни отличаются только #фрагментом, и переход между ними в прогретом
+    # драйвере не перезагружает страницу, поэтому сначала уходим на пустую
+    driver.get("about:blank")
+    driver.get(url)
+    wait_for_page(driver, DAY_READY_SELECTORS, "day")
+    if get_snapshot_store() is not None:
+        save_snapshot(url, DAY_KIND, driver.page_source)
+
+    # Уже сохраненные URL берем из индекса хранилища, чтобы не парсить повторно
+    if known_urls is None:
+        known_urls = get_match_store().url_snapshot()
+    seen_urls = set(known_urls)
+
+    for selector in MATCH_SELECTORS:
+        try:
+            # Тексты и ссылки всех матчей за один вызов вместо запроса на элемент
+            items = driver.execute_script(RESULTS_ITEMS_SCRIPT, selector)
+        except Exception as e:
+            print(f"Ошибка с селектором {selector}: {e}")
+            break
+        matches_data.extend(collect_matches(items, url, league, seen_urls))
+
+    return matches_data
@@ -0,0 +1,113 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from tools.database_tools.generate_db import create_hockey_database, JSON_PATH, DB_PATH
+from tools.http_tools.parse_day_html import parse_day_html
+from tools.http_tools.parse_match_html import parse_match_html
+from tools.json_tools.match_store import get_match_store
+from tools.json_tools.save_to_json import store_path_for
+from tools.progress import Progress
+from tools.read_data_from_page import MATCH_SELECTORS, build_match_stats, collect_matches
+from tools.snapshot_tools.snapshot_store import (
+    SnapshotStore,
+    load_snapshot,
+    SNAPSHOT_DIR,
+    DAY_KIND,
+    MATCH_KIND,
+)
+
+
+def parse_day_snapshot(root, url, digest, league):
+    """Матчи нужной лиги (без составов) из снимка страницы дня"""
+    html = load_snapshot(root, digest)
+    matches = []
+    seen_urls = set()
+    for selector in MATCH_SELECTORS:
+        items = parse_day_html(html, url, selector.lstrip("."))
+        matches.extend(collect_matches(items, url, league, seen_urls))
+    return matches
+
+
+def parse_match_snapshot(root, digest, score):
+    """Статистика матча из снимка его страницы, 0 - если разобрать не удалось"""
+    payload = parse_match_html(load_snapshot(root, digest))
+    if payload is None:
+        return 0
+    score_team1, score_team2 = [int(x) for x in score.split(":")]
+    try:
+        return build_match_stats(payload, score_team1, score_team2)
+    except Exception as e:
+        print(f"Ошибка при парсинге составов: {e}")
+        return 0
+
+
+def reparse(league="all", output_dir=".", workers=None, root=SNAPSHOT_DIR):
+    """
+    Заново строит matches_data.json и hockey_matches.db из сохраненных
+    снимков страниц (см. runner(snapshots=True)), без обращения к сети.
+    Страницы разбираются теми же функциями, что и при парсинге,
+    параллельно в workers процессах (по умолчанию - по числу ядер).
+    Дни идут от новых к старым, как в runner; матч, встретившийся
+    на нескольких днях, берется с самого нового.
+    Возвращает пути к файлам и длительности этапов, как runner.
+    """
+    workers = workers or os.cpu_count() or 1
+    snapshots = SnapshotStore(root)
+    day_index = snapshots.index(DAY_KIND)
+    match_index = snapshots.index(MATCH_KIND)
+    print(f"Снимков: дней {len(day_index)}, матчей {len(match_index)}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    json_path = os.path.join(output_dir, JSON_PATH)
+    db_path = os.path.join(output_dir, DB_PATH)
+
+    progress = Progress()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        with progress.stage("reparse_days", "разбор страниц дней"):
+            # URL дней отличаются только датой во фрагменте, сортировка по строке - по дате
+            day_urls = sorted(day_index, reverse=True)
+            day_results = executor.map(
+                parse_day_snapshot,
+                repeat(root),
+                day_urls,
+                [day_index[url] for url in day_urls],
+                repeat(league),
+            )
+            matches = []
+            seen_urls = set()
+            for day_matches in day_results:
+                for match in day_matches:
+                    if match["url"] not in seen_urls:
+                        seen_urls.add(match["url"])
+                        matches.append(match)
+
+        with progress.stage("reparse_matches", "разбор страниц матчей"):
+            missing = [match for match in matches if match["url"] not in match_index]
+            if missing:
+                print(f"Нет снимков страниц для {len(missing)} матчей, они пропущены")
+            matches = [match for match in matches if match["url"] in match_index]
+            stats = executor.map(
+                parse_match_snapshot,
+                repeat(root),
+                [match_index[match["url"]] for match in matches],
+                [match["score"] for match in matches],
+                chunksize=max(1, len(matches) // (workers * 4)),
+            )
+            matches_data = []
+            for match, lineup_data in zip(matches, stats):
+                if lineup_data:
+                    match["stats"] = lineup_data
+                    matches_data.append(match)
+
+    with progress.stage("export_json", "выгрузку json"):
+        store = get_match_store(store_path_for(json_path))
+        store.clear()
+        store.append(matches_data)
+        store.export_json(json_path)
+
+    with progress.stage("database", "создание db"):
+        create_hockey_database(json_path, db_path)
+
+    print(f"Пересобрано матчей: {len(matches_data)}")
+    progress.print_summary()
+    return {"json": json_path, "db": db_path, "timings": progress.summary()}
@@ -0,0 +1,32 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+
+def create_driver():
+    """Создает headless Chrome с настройками для быстрого парсинга"""
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument(
+        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    )
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+
+    options.add_argument("--disable-images")
+    # options.add_argument("--disable-javascript")  # осторожно, может сломать сайт
+    options.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,  # Отключаем изображения
+            "profile.managed_default_content_settings.stylesheets": 2,  # Отключаем CSS
+        },
+    )
+
+    # Более агрессивные настройки для скорости
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+
+    return webdriver.Chrome(options=options)
@@ -0,0 +1,140 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from selenium.common.exceptions import WebDriverException
+from tools.selenium_tools.create_driver import create_driver
+
+POOL_SIZE = 1
+MAX_PAGES_PER_DRIVER = 100
+
+
+class DriverPool:
+    """
+    Пул прогретых Chrome-драйверов, которые переиспользуются между страницами.
+    Драйверы создаются лениво, проверяются перед выдачей и пересоздаются
+    после max_pages загруженных страниц или после падения браузера.
+    """
+
+    def __init__(self, size=POOL_SIZE, max_pages=MAX_PAGES_PER_DRIVER):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self._idle = []
+        self._pages = {}
+        self._created = 0
+        self._lock = threading.Lock()
+        # Ждущие в acquire просыпаются, когда драйвер вернули в пул
+        # или когда освободилось место под новый
+        self._available = threading.Condition(self._lock)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _is_alive(self, driver):
+        """Проверка здоровья: браузер отвечает на простой запрос"""
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        """Закрывает драйвер и освобождает место в пуле"""
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._available:
+            self._pages.pop(id(driver), None)
+            self._created -= 1
+            self._available.notify()
+
+    def _create(self):
+        """Создает драйвер на место, уже занятое в _created"""
+        try:
+            driver = create_driver()
+        except Exception:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+        with self._lock:
+            self._pages[id(driver)] = 0
+        return driver
+
+    def _take(self, timeout=None):
+        """
+        Ждет простаивающий драйвер или свободное место в пуле.
+        Возвращает драйвер либо None, если место занято под новый.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._available:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self._available.wait(remaining)
+
+    def acquire(self, timeout=None):
+        """Выдает живой драйвер, при необходимости создавая новый"""
+        while True:
+            driver = self._take(timeout)
+            if driver is None:
+                return self._create()
+            if self._is_alive(driver):
+                return driver
+            print("Драйвер не отвечает, пересоздаем")
+            self._discard(driver)
+
+    def count_pages(self, driver, pages=1):
+        """Учитывает страницы, загруженные драйвером, для последующей ротации"""
+        with self._lock:
+            used = self._pages.get(id(driver), 0) + pages
+            self._pages[id(driver)] = used
+        return used
+
+    def release(self, driver, pages=1, broken=False):
+        """Возвращает драйвер в пул, учитывая количество загруженных страниц"""
+        used = self.count_pages(driver, pages)
+
+        if broken or used >= self.max_pages:
+            self._discard(driver)
+        else:
+            with self._available:
+                self._idle.append(driver)
+                self._available.notify()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """
+        Контекстный менеджер для аренды драйвера.
+        Если браузер упал во время работы, он не возвращается в пул.
+        """
+        driver = self.acquire(timeout=timeout)
+        try:
+            yield driver
+        except WebDriverException:
+            self.release(driver, broken=True)
+            raise
+        except BaseException:
+            self.release(driver)
+            raise
+        else:
+            self.release(driver)
+
+    def close(self):
+        """Закрывает все простаивающие драйверы"""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                driver = self._idle.pop()
+            self._discard(driver)
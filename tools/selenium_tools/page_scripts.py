@@ -0,0 +1,31 @@
+# JS-сниппеты, которые за один вызов execute_script собирают все данные страницы.
+# Каждый element.text / find_elements в Selenium - отдельный HTTP-запрос к драйверу,
+# а здесь весь DOM обходится внутри браузера и возвращается одним JSON.
+
+MATCH_PAGE_SCRIPT = """
+const texts = (selector) => Array.from(
+    document.querySelectorAll(selector), (el) => el.innerText.trim()
+);
+return {
+    names: texts('.table-item__name'),
+    positions: texts('.table-item__amplua'),
+    goals: texts('.match-stat__player'),
+    extra: Array.from(document.querySelectorAll('.match-info__extra-row'), (row) => {
+        const link = row.querySelector('a');
+        return {
+            text: row.innerText.trim(),
+            link: link ? link.innerText.trim() : null,
+        };
+    }),
+};
+"""
+
+RESULTS_ITEMS_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0]), (el) => {
+    const link = el.querySelector('a');
+    return {
+        text: el.innerText,
+        href: link ? link.href : (el.href || el.getAttribute('href')),
+    };
+});
+"""
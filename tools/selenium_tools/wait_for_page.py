@@ -0,0 +1,90 @@
+import threading
+import time
+
+POLL_INTERVAL = 0.1
+# Сколько секунд без новых сетевых запросов считается "сеть затихла"
+NETWORK_IDLE = 0.5
+
+READY_SCRIPT = """
+const selectors = arguments[0];
+return {
+    found: selectors.filter((s) => document.querySelector(s) !== null),
+    complete: document.readyState === 'complete',
+    resources: performance.getEntriesByType('resource').length,
+};
+"""
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record_wait(name, waited, complete):
+    with _stats_lock:
+        stats = _stats.setdefault(
+            name, {"count": 0, "total": 0.0, "max": 0.0, "not_found": 0}
+        )
+        stats["count"] += 1
+        stats["total"] += waited
+        stats["max"] = max(stats["max"], waited)
+        if not complete:
+            stats["not_found"] += 1
+
+
+def wait_for_page(driver, selectors, name="page", poll_interval=POLL_INTERVAL):
+    """
+    Ждет готовности страницы вместо фиксированного time.sleep.
+    selectors - словарь {css-селектор: таймаут в секундах}.
+    Ждет, пока в DOM появятся все селекторы: каждый из них перестает
+    ждаться после своего таймаута. Если страница загружена и сеть затихла,
+    а селекторов так и нет, ожидание заканчивается раньше.
+    Возвращает список появившихся селекторов (пустой, если ни одного).
+    Фактическое время ожидания копится в статистике под именем name.
+    """
+    start = time.monotonic()
+    pending = dict(selectors)
+    found = []
+    last_resources = None
+    last_activity = start
+
+    while pending:
+        state = driver.execute_script(READY_SCRIPT, list(pending))
+        now = time.monotonic()
+        for selector in state["found"]:
+            found.append(selector)
+            pending.pop(selector, None)
+        if not pending:
+            break
+
+        if state["resources"] != last_resources:
+            last_resources = state["resources"]
+            last_activity = now
+        elif state["complete"] and now - last_activity >= NETWORK_IDLE:
+            break
+
+        elapsed = now - start
+        pending = {
+            selector: timeout
+            for selector, timeout in pending.items()
+            if timeout > elapsed
+        }
+        if pending:
+            time.sleep(poll_interval)
+
+    _record_wait(name, time.monotonic() - start, len(found) == len(selectors))
+    return found
+
+
+def get_wait_stats():
+    """Возвращает копию статистики ожиданий по типам страниц"""
+    with _stats_lock:
+        return {name: dict(stats) for name, stats in _stats.items()}
+
+
+def print_wait_stats():
+    for name, stats in get_wait_stats().items():
+        average = stats["total"] / stats["count"] if stats["count"] else 0
+        print(
+            f"Ожидание страниц '{name}': {stats['count']} раз, "
+            f"в среднем {round(average, 3)} c, максимум {round(stats['max'], 3)} c, "
+            f"без нужных элементов {stats['not_found']}"
+        )
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+SNAPSHOT_DIR = "./snapshots"
+DAY_KIND = "day"
+MATCH_KIND = "match"
+
+
+# Соединения, унаследованные через fork, см. _connect
+_inherited_connections = []
+
+
+class SnapshotStore:
+    """
+    Хранилище сырого HTML страниц дней и матчей для повторного разбора без сети.
+    HTML сжимается zlib и лежит в objects/<первые 2 символа sha256>/<sha256>:
+    одинаковые страницы хранятся один раз. В index.db для каждого URL
+    записан хеш его последнего снимка.
+    """
+
+    def __init__(self, root=SNAPSHOT_DIR):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.index_path = os.path.join(root, "index.db")
+        self._local = threading.local()
+        self._connect().execute(
+            """CREATE TABLE IF NOT EXISTS snapshots (
+                   url TEXT PRIMARY KEY,
+                   kind TEXT NOT NULL,
+                   digest TEXT NOT NULL,
+                   captured_at REAL NOT NULL
+               )"""
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid != os.getpid():
+            # Соединение досталось от родителя через fork (пул процессов бота):
+            # SQLite запрещает им пользоваться, а закрытие может тронуть WAL
+            # родителя, поэтому оно просто остается неиспользованным
+            _inherited_connections.append(conn)
+            conn = None
+        if conn is None:
+            conn = sqlite3.connect(self.index_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def object_path(self, digest):
+        return object_path(self.root, digest)
+
+    def save(self, url, kind, html):
+        """Сохраняет HTML страницы url, возвращает его хеш"""
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(zlib.compress(data))
+            os.replace(tmp_path, path)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO snapshots(url, kind, digest, captured_at) VALUES (?, ?, ?, ?)",
+            (url, kind, digest, time.time()),
+        )
+        return digest
+
+    def index(self, kind):
+        """{url: digest} всех снимков вида kind"""
+        return dict(
+            self._connect().execute(
+                "SELECT url, digest FROM snapshots WHERE kind = ?", (kind,)
+            )
+        )
+
+
+def object_path(root, digest):
+    return os.path.join(root, "objects", digest[:2], digest)
+
+
+def load_snapshot(root, digest):
+    """Читает HTML снимка по хешу; функция верхнего уровня, чтобы звать ее из пула процессов"""
+    with open(object_path(root, digest), "rb") as f:
+        return zlib.decompress(f.read()).decode("utf-8")
+
+
+_snapshot_store = None
+_snapshot_lock = threading.Lock()
+
+
+def configure_snapshots(root=None):
+    """
+    Включает (root - каталог хранилища) или выключает (None) сохранение
+    снимков страниц в этом процессе.
+    """
+    global _snapshot_store
+    with _snapshot_lock:
+        if root is None:
+            _snapshot_store = None
+        elif _snapshot_store is None or _snapshot_store.root != root:
+            _snapshot_store = SnapshotStore(root)
+
+
+def get_snapshot_store():
+    """Возвращает SnapshotStore процесса или None, если снимки не сохраняются"""
+    return _snapshot_store
+
+
+def save_snapshot(url, kind, html):
+    """Сохраняет снимок, если хранилище включено; ошибки не прерывают парсинг"""
+    store = get_snapshot_store()
+    if store is None or not html:
+        return
+    try:
+        store.save(url, kind, html)
+    except Exception as e:
+        print(f"Не удалось сохранить снимок {url}: {e}")